@@ -14,7 +14,7 @@ import * as custom from "./tools/custom.js";
 import * as snapshot from "./tools/snapshot.js";
 import type { Tool } from "./tools/tool.js";
 import { localToolManager } from "./local-tool-manager.js";
-import { browserRecorder } from "./recorder.js";
+import { browserRecorder, TOOL_GENERATOR_VERSION } from "./recorder.js";
 import { agentRegistry } from "./agent-registry.js";
 import { serverManager } from "./server-manager.js";
 import { customToolManager } from "./custom-tool-manager.js";
@@ -104,8 +104,8 @@ function isExtensionConnected(): boolean {
   return httpConnected;
 }
 
-// Extension connection status endpoint
-app.get("/extension/status", (req, res) => {
+// Current extension connection status, shared by /extension/status and /bootstrap
+function getExtensionStatus() {
   const context = getServerContext();
   const wsReady = context && context.hasWs();
   const connected = isExtensionConnected();
@@ -116,13 +116,18 @@ app.get("/extension/status", (req, res) => {
     console.log("🔍 Connection status check: extension hasn't pinged in", (now - lastExtensionPing) / 1000, "seconds");
   }
   
-  res.json({ 
+  return { 
     connected: connected,
     websocketReady: wsReady,
     timestamp: new Date().toISOString(),
     lastPing: lastExtensionPing > 0 ? new Date(lastExtensionPing).toISOString() : null,
     message: connected ? "Extension HTTP connected" : "Extension not connected"
-  });
+  };
+}
+
+// Extension connection status endpoint
+app.get("/extension/status", (req, res) => {
+  res.json(getExtensionStatus());
 });
 
 // WebSocket connection tracking endpoints (for extension to notify connection status)
@@ -462,6 +467,29 @@ app.get("/tools", async (req, res) => {
   }
 });
 
+// Convert an MCP tool result into the REST reply shared by /tools/:toolName/execute and /tools/batch_execute
+function toToolResponse(toolName: string, toolArgs: any, result: any) {
+  let responseData: any = {
+    success: true,
+    message: `Tool ${toolName} executed successfully`,
+    arguments: toolArgs
+  };
+
+  // Extract text content from MCP result
+  if (result && result.content) {
+    const textContent = result.content
+      .filter(item => item.type === 'text')
+      .map(item => item.text)
+      .join('\n');
+    
+    if (textContent) {
+      responseData.result = textContent;
+    }
+  }
+
+  return responseData;
+}
+
 // Execute a tool
 app.post("/tools/:toolName/execute", async (req, res) => {
   try {
@@ -491,27 +519,7 @@ app.post("/tools/:toolName/execute", async (req, res) => {
     // Execute the tool using the actual context
     try {
       const result = await tool.handle(context, toolArgs);
-      
-      // Convert MCP result format to REST API format
-      let responseData = {
-        success: true,
-        message: `Tool ${toolName} executed successfully`,
-        arguments: toolArgs
-      };
-
-      // Extract text content from MCP result
-      if (result && result.content) {
-        const textContent = result.content
-          .filter(item => item.type === 'text')
-          .map(item => item.text)
-          .join('\n');
-        
-        if (textContent) {
-          responseData.result = textContent;
-        }
-      }
-
-      res.json(responseData);
+      res.json(toToolResponse(toolName, toolArgs, result));
     } catch (toolError) {
       console.error(`Tool execution error for ${toolName}:`, toolError);
       res.status(500).json({ 
@@ -525,6 +533,60 @@ app.post("/tools/:toolName/execute", async (req, res) => {
   }
 });
 
+// Execute several tools in one request
+app.post("/tools/batch_execute", async (req, res) => {
+  try {
+    await initializeMCPServer();
+    const { calls = [], stopOnError = false } = req.body;
+
+    if (!Array.isArray(calls)) {
+      return res.status(400).json({ error: "calls must be an array of { tool, arguments }" });
+    }
+
+    const context = getServerContext();
+    if (!context || !context.hasWs()) {
+      return res.status(400).json({ 
+        error: "No browser extension connected. Please connect the browser extension first.",
+        connected: false
+      });
+    }
+
+    // Browser actions depend on each other (navigate before screenshot),
+    // so calls run in order against the single connected tab
+    const results = [];
+    for (const call of calls) {
+      const toolName = call?.tool;
+      const toolArgs = call?.arguments || {};
+      const tool = snapshotTools.find(t => t.schema.name === toolName);
+
+      if (!tool) {
+        results.push({ success: false, error: `Tool "${toolName}" not found`, tool: toolName });
+      } else {
+        try {
+          const result = await tool.handle(context, toolArgs);
+          results.push(toToolResponse(toolName, toolArgs, result));
+        } catch (toolError) {
+          console.error(`Tool execution error for ${toolName}:`, toolError);
+          results.push({
+            success: false,
+            error: `Tool execution failed: ${String(toolError)}`,
+            tool: toolName,
+            arguments: toolArgs
+          });
+        }
+      }
+
+      if (stopOnError && !results[results.length - 1].success) {
+        break;
+      }
+    }
+
+    res.json({ results });
+  } catch (error) {
+    res.status(500).json({ error: String(error) });
+  }
+});
+
 // Chat endpoint for agent interactions
 app.post("/chat", async (req, res) => {
   try {
@@ -653,22 +715,40 @@ app.get("/recorder/status", (req, res) => {
   }
 });
 
+// Summaries of all recording sessions, shared by /recorder/sessions and /bootstrap
+function getSessionSummaries() {
+  return browserRecorder.getAllSessions().map(session => ({
+    id: session.id,
+    name: session.name,
+    description: session.description,
+    status: session.status,
+    actionsCount: session.actions.length,
+    startTime: session.startTime,
+    endTime: session.endTime,
+    duration: session.endTime ? session.endTime - session.startTime : Date.now() - session.startTime
+  }));
+}
+
 // Get all recording sessions
 app.get("/recorder/sessions", async (req, res) => {
   try {
-    const sessions = browserRecorder.getAllSessions();
     res.json({
       success: true,
-      sessions: sessions.map(session => ({
-        id: session.id,
-        name: session.name,
-        description: session.description,
-        status: session.status,
-        actionsCount: session.actions.length,
-        startTime: session.startTime,
-        endTime: session.endTime,
-        duration: session.endTime ? session.endTime - session.startTime : Date.now() - session.startTime
-      }))
+      sessions: getSessionSummaries()
+    });
+  } catch (error) {
+    res.status(500).json({ error: String(error) });
+  }
+});
+
+// Health, extension status and recording sessions in one response, so the
+// recorder page can load with a single round-trip
+app.get("/bootstrap", async (req, res) => {
+  try {
+    res.json({
+      health: { status: "ok", service: "MyMCP.me Backend API" },
+      extensionStatus: getExtensionStatus(),
+      sessions: { success: true, sessions: getSessionSummaries() }
     });
   } catch (error) {
     res.status(500).json({ error: String(error) });
@@ -685,6 +765,21 @@ app.get("/recorder/sessions/:sessionId", async (req, res) => {
       return res.status(404).json({ error: "Session not found" });
     }
 
+    // Optional ?offset=&limit= return one page of actions plus the total count and the tool generator version
+    if (req.query.offset !== undefined || req.query.limit !== undefined) {
+      const offset = Math.max(0, parseInt(String(req.query.offset ?? "0"), 10) || 0);
+      const limit = Math.max(0, parseInt(String(req.query.limit ?? "50"), 10) || 0);
+      return res.json({
+        success: true,
+        session: {
+          ...session,
+          actions: session.actions.slice(offset, offset + limit),
+          actionsTotal: session.actions.length,
+          generatorVersion: TOOL_GENERATOR_VERSION
+        }
+      });
+    }
+
     res.json({
       success: true,
       session
@@ -724,30 +819,38 @@ app.get("/recorder/connection-status", (req, res) => {
   });
 });
 
+// Normalize an action posted by a client into the recorder's action shape
+function toRecorderAction(body: any) {
+  const { action, type, selector, url, text, value, timestamp, description } = body;
+  const actionType = action || type;
+  if (!actionType) {
+    return null;
+  }
+  return {
+    type: actionType,
+    selector,
+    url,
+    text: text || value, // Use either text or value
+    timestamp: timestamp || Date.now(),
+    description: description || `${actionType} action`
+  };
+}
+
 // Record an action from content script
 app.post("/recorder/action", async (req, res) => {
   try {
-    const { sessionId, action, type, selector, url, text, value, timestamp, description } = req.body;
+    const { sessionId, action } = req.body;
     
     if (!sessionId) {
       return res.status(400).json({ error: "Session ID is required" });
     }
     
-    const actionType = action || type;
-    if (!actionType) {
+    // Create action object for recorder
+    const actionData = toRecorderAction(req.body);
+    if (!actionData) {
       return res.status(400).json({ error: "Action type is required" });
     }
 
-    // Create action object for recorder
-    const actionData = {
-      type: actionType,
-      selector,
-      url,
-      text: text || value, // Use either text or value
-      timestamp: timestamp || Date.now(),
-      description: description || `${actionType} action`
-    };
-
     // Record action via session-aware method
     browserRecorder.recordActionFromCDP(sessionId, actionData);
 
@@ -761,6 +864,39 @@ app.post("/recorder/action", async (req, res) => {
   }
 });
 
+// Record several actions for one session in a single request
+app.post("/recorder/actions/batch", async (req, res) => {
+  try {
+    const { sessionId, actions } = req.body;
+    
+    if (!sessionId) {
+      return res.status(400).json({ error: "Session ID is required" });
+    }
+    if (!Array.isArray(actions)) {
+      return res.status(400).json({ error: "actions must be an array" });
+    }
+    
+    // Validate the whole batch before recording any of it
+    const actionData = actions.map(toRecorderAction);
+    if (actionData.some((a) => !a)) {
+      return res.status(400).json({ error: "Action type is required for every action" });
+    }
+
+    for (const a of actionData) {
+      browserRecorder.recordActionFromCDP(sessionId, a!);
+    }
+
+    res.json({
+      success: true,
+      recorded: actionData.length,
+      message: `Recorded ${actionData.length} actions successfully`
+    });
+  } catch (error) {
+    console.error('Error recording actions:', error);
+    res.status(500).json({ error: String(error) });
+  }
+});
+
 // Delete a recording session
 app.delete("/recorder/sessions/:sessionId", async (req, res) => {
   try {
@@ -1454,12 +1590,22 @@ app.delete("/agents/:agentId", async (req, res) => {
 // Install a marketplace server
 app.post("/servers/install", async (req, res) => {
   try {
-    const { serverName, config } = req.body;
+    const { serverName, config, precheck = false } = req.body;
     
     if (!serverName) {
       return res.status(400).json({ error: "serverName is required" });
     }
 
+    // Optionally refuse servers still missing credentials, so clients can
+    // check setup and install in a single request
+    if (precheck && setupManager.needsSetup(serverName)) {
+      return res.status(409).json({
+        error: `Server "${serverName}" needs setup before installation`,
+        setupRequired: true,
+        missingRequirements: setupManager.getMissingRequirements(serverName)
+      });
+    }
+
     let serverId: string;
     
     if (config) {
@@ -1767,22 +1913,31 @@ app.post("/local-tools/toggle", async (req, res) => {
 // === SETUP MANAGEMENT ENDPOINTS ===
 // These endpoints handle intelligent API key setup for marketplace servers
 
+// A server's setup payload, shared by /setup/:serverName and /setup?include=requirements; null when it has none
+function getSetupPayload(serverName: string) {
+  const setup = setupManager.getSetupRequirements(serverName);
+  if (!setup) {
+    return null;
+  }
+  return {
+    success: true,
+    setup,
+    needsSetup: setupManager.needsSetup(serverName),
+    missingRequirements: setupManager.getMissingRequirements(serverName)
+  };
+}
+
 // Get setup requirements for a server
 app.get("/setup/:serverName", async (req, res) => {
   try {
     const { serverName } = req.params;
-    const requirements = setupManager.getSetupRequirements(serverName);
+    const payload = getSetupPayload(serverName);
     
-    if (!requirements) {
+    if (!payload) {
       return res.status(404).json({ error: `No setup information available for ${serverName}` });
     }
 
-    res.json({
-      success: true,
-      setup: requirements,
-      needsSetup: setupManager.needsSetup(serverName),
-      missingRequirements: setupManager.getMissingRequirements(serverName)
-    });
+    res.json(payload);
   } catch (error) {
     res.status(500).json({ error: String(error) });
   }
@@ -1841,6 +1996,22 @@ app.get("/setup", async (req, res) => {
   try {
     const servers = setupManager.getAllServersWithSetupStatus();
     
+    // ?include=requirements also returns each server's /setup/:serverName payload, keyed by serverName
+    if (req.query.include === "requirements") {
+      const requirements: Record<string, any> = {};
+      for (const server of servers) {
+        const payload = getSetupPayload(server.serverName);
+        if (payload) {
+          requirements[server.serverName] = payload;
+        }
+      }
+      return res.json({
+        success: true,
+        servers: servers,
+        requirements
+      });
+    }
+    
     res.json({
       success: true,
       servers: servers
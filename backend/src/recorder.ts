@@ -21,6 +21,9 @@ interface RecordingSession {
   status: 'recording' | 'stopped' | 'completed';
 }
 
+// Bump whenever generateToolFromSession output changes; clients key cached tool code on it
+export const TOOL_GENERATOR_VERSION = 1;
+
 export class BrowserRecorder {
   private currentSession: RecordingSession | null = null;
   private lastCompletedSession: RecordingSession | null = null;
@@ -1,119 +1,205 @@
 import streamlit as st
-import requests
+import asyncio
 import json
+import orjson
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from functools import lru_cache
 from typing import Dict, Any, List
 
+# requests, urllib3 and httpx are imported where they are used, so reruns
+# that never reach the backend don't pay for loading the network stack
+
+@lru_cache(maxsize=None)
+def _get_retry():
+    """Retry policy for transient backend failures"""
+    from urllib3.util.retry import Retry
+    # Status retries only apply to idempotent methods, so tool POSTs are
+    # retried on connection errors alone
+    return Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+
+@lru_cache(maxsize=None)
+def _get_pool():
+    """Leaner pool for the per-turn tool execution hot path"""
+    import urllib3
+    return urllib3.PoolManager(num_pools=4, maxsize=20, retries=_get_retry())
+
+# Tools that only read the page, so they can run side by side
+_READ_ONLY_TOOLS = frozenset({"browser_screenshot", "browser_snapshot"})
+
+def get_http_session():
+    """Get this user's pooled HTTP session, kept across reruns"""
+    if "http" not in st.session_state:
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=5, pool_maxsize=10, max_retries=_get_retry()))
+        st.session_state.http = session
+    return st.session_state.http
+
 def get_backend_api_url():
     """Get the backend API URL"""
     return "http://localhost:8100"
 
 def call_mcp_tool(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
     """Call an MCP tool through the backend API"""
+    import urllib3
     try:
         backend_url = get_backend_api_url()
-        response = requests.post(
+        response = _get_pool().request(
+            "POST",
             f"{backend_url}/tools/{tool_name}/execute",
-            json={"arguments": arguments},
-            timeout=30
+            body=orjson.dumps({"arguments": arguments}),
+            headers={"Content-Type": "application/json"},
+            timeout=30.0
         )
         
-        if response.status_code == 200:
-            return response.json()
+        if response.status == 200:
+            return orjson.loads(response.data)
         else:
             return {
                 "success": False,
-                "error": f"HTTP {response.status_code}: {response.text}"
+                "error": f"HTTP {response.status}: {response.data.decode('utf-8', errors='replace')}"
             }
-    except Exception as e:
+    except (urllib3.exceptions.HTTPError, orjson.JSONDecodeError) as e:
         return {
             "success": False,
             "error": f"Request failed: {str(e)}"
         }
 
-def get_available_tools() -> List[Dict[str, Any]]:
-    """Get list of available MCP tools"""
+def call_mcp_tools_batch(calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Call several MCP tools in one backend request, results in call order"""
+    import requests
     try:
         backend_url = get_backend_api_url()
-        response = requests.get(f"{backend_url}/tools", timeout=5)
+        response = get_http_session().post(
+            f"{backend_url}/tools/batch_execute",
+            json={"calls": calls, "stopOnError": False},
+            timeout=60
+        )
+        
         if response.status_code == 200:
-            return response.json().get('tools', [])
+            return response.json().get('results', [])
         else:
-            return []
-    except Exception:
+            error = f"HTTP {response.status_code}: {response.text}"
+    except requests.exceptions.RequestException as e:
+        error = f"Request failed: {str(e)}"
+    return [{"success": False, "error": error} for _ in calls]
+
+async def _acall_mcp_tools(calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Dispatch tool calls concurrently over one pooled async client"""
+    import httpx
+    backend_url = get_backend_api_url()
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        async def _acall(tool: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                response = await client.post(
+                    f"{backend_url}/tools/{tool}/execute",
+                    json={"arguments": arguments}
+                )
+                if response.status_code == 200:
+                    return response.json()
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}: {response.text}"
+                }
+            except (httpx.HTTPError, ValueError) as e:
+                return {
+                    "success": False,
+                    "error": f"Request failed: {str(e)}"
+                }
+        
+        return await asyncio.gather(*(_acall(c['tool'], c['arguments']) for c in calls))
+
+def call_mcp_tools_parallel(calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Call independent MCP tools concurrently, results in call order"""
+    return asyncio.run(_acall_mcp_tools(calls))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_available_tools() -> List[Dict[str, Any]]:
+    """Get list of available MCP tools"""
+    import requests
+    try:
+        backend_url = get_backend_api_url()
+        # Stream so error responses are released back to the pool unread
+        with get_http_session().get(f"{backend_url}/tools", timeout=5, stream=True) as response:
+            if response.status_code == 200:
+                return response.json().get('tools', [])
+            else:
+                return []
+    except requests.exceptions.RequestException:
         return []
 
+# Explicit http(s) URLs or bare hosts on a common domain, without trailing
+# sentence punctuation ("go to example.com." navigates to example.com)
+_URL_PATTERN = (
+    r"https?://\S+?(?=[.,;:!?)]*(?:\s|$))"
+    r"|\b[\w.-]+\.(?:com|org|net|gov|edu)\b(?:[/?#]\S*?(?=[.,;:!?)]*(?:\s|$)))?"
+)
+_URL_RE = re.compile(_URL_PATTERN, re.IGNORECASE)
+
+# Intent keywords and their arguments, matched in a single pass over the message
+_TOOL_REQUEST_RE = re.compile(
+    rf"(?P<navigate>\b(?:navigate|go to)\b(?:.*?(?P<url>{_URL_PATTERN}))?)"
+    r"|(?P<screenshot>\bscreenshot\b|\btake a picture\b)"
+    r"|(?P<click>\bclick\b(?:\s+(?:on|the)\b)*\s*(?P<target>[^.]*))"
+    r"|(?P<type>\btype\b[^\"']*(?P<quote>[\"'])(?P<text>.+?)(?P=quote)\s*(?:\bin(?:to)?\s+(?P<field>.+))?)"
+    r"|(?P<unparsed>\btype\b|\benter\b)"
+    r"|(?P<snapshot>\bsnapshot\b|\bpage content\b)",
+    re.IGNORECASE
+)
+
 def parse_tool_request(message: str) -> Dict[str, Any]:
     """Simple parser to extract tool calls from natural language"""
-    message_lower = message.lower()
+    match = _TOOL_REQUEST_RE.search(message)
+    if not match:
+        return None
+    intent = match.lastgroup
     
     # Navigate tool
-    if "navigate" in message_lower or "go to" in message_lower:
-        # Extract URL - look for http/https URLs or common domains
-        words = message.split()
-        url = None
-        for word in words:
-            if word.startswith(('http://', 'https://')):
-                url = word
-                break
-            elif any(domain in word for domain in ['.com', '.org', '.net', '.gov', '.edu']):
-                if not word.startswith('http'):
-                    url = f"https://{word}"
-                else:
-                    url = word
-                break
-        
+    if intent == "navigate":
+        # Prefer a URL after the keyword, else any URL in the message
+        url = match.group("url")
+        if not url:
+            url_match = _URL_RE.search(message)
+            url = url_match.group() if url_match else None
         if url:
+            if not url.startswith('http'):
+                url = f"https://{url}"
             return {
                 "tool": "browser_navigate",
                 "arguments": {"url": url}
             }
     
     # Screenshot tool
-    elif "screenshot" in message_lower or "take a picture" in message_lower:
+    elif intent == "screenshot":
         return {
             "tool": "browser_screenshot",
             "arguments": {}
         }
     
     # Click tool
-    elif "click" in message_lower:
-        # Extract element text after "click"
-        click_idx = message_lower.find("click")
-        after_click = message[click_idx + 5:].strip()
-        # Remove common words
-        element = after_click.replace("on", "").replace("the", "").strip()
+    elif intent == "click":
+        element = match.group("target").strip()
         if element:
             return {
                 "tool": "browser_click",
                 "arguments": {"element": element}
             }
     
-    # Type tool
-    elif "type" in message_lower or "enter" in message_lower:
-        # Extract text to type
-        if "type" in message_lower:
-            type_idx = message_lower.find("type")
-            after_type = message[type_idx + 4:].strip()
-            # Look for patterns like 'type "text" in field' or 'type text into field'
-            if '"' in after_type:
-                text_start = after_type.find('"') + 1
-                text_end = after_type.find('"', text_start)
-                if text_end > text_start:
-                    text = after_type[text_start:text_end]
-                    # Find field after the text
-                    remaining = after_type[text_end + 1:].strip()
-                    if remaining.startswith("in") or remaining.startswith("into"):
-                        field = remaining.split(None, 1)[1] if len(remaining.split()) > 1 else "input"
-                    else:
-                        field = "input"
-                    
-                    return {
-                        "tool": "browser_type",
-                        "arguments": {"element": field, "text": text}
-                    }
+    # Type tool, e.g. 'type "text" in field' or 'type "text" into field'
+    elif intent == "type":
+        return {
+            "tool": "browser_type",
+            "arguments": {"element": (match.group("field") or "input").strip(), "text": match.group("text")}
+        }
     
     # Snapshot tool
-    elif "snapshot" in message_lower or "page content" in message_lower:
+    elif intent == "snapshot":
         return {
             "tool": "browser_snapshot",
             "arguments": {}
@@ -121,12 +207,92 @@ def parse_tool_request(message: str) -> Dict[str, Any]:
     
     return None
 
+# Clause separators for multi-action messages, ignored inside quoted text
+_CLAUSE_SPLIT_RE = re.compile(r'\s*(?:;|,?\s*\b(?:and then|then|and)\b)\s*(?=(?:[^"]*"[^"]*")*[^"]*$)', re.IGNORECASE)
+
+def parse_tool_requests(message: str) -> List[Dict[str, Any]]:
+    """Extract one tool call per clause, e.g. "go to example.com and take a screenshot" """
+    clauses = [c for c in _CLAUSE_SPLIT_RE.split(message) if c]
+    if len(clauses) > 1:
+        calls = [parse_tool_request(clause) for clause in clauses]
+        if all(calls):
+            return calls
+    
+    # Not a clean multi-action message - treat it as a single request
+    tool_request = parse_tool_request(message)
+    return [tool_request] if tool_request else []
+
+# Number of most recent chat messages rendered by default
+CHAT_PAGE_SIZE = 20
+
+# Chat history lives on disk so session state doesn't grow with the conversation
+CHAT_DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'workbench', 'agent_chat.db')
+
+@st.cache_resource
+def get_chat_db():
+    """Open the shared chat history database (WAL mode, autocommit)"""
+    os.makedirs(os.path.dirname(CHAT_DB_PATH), exist_ok=True)
+    db = sqlite3.connect(CHAT_DB_PATH, check_same_thread=False, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS agent_messages ("
+        "sid TEXT, idx INTEGER, role TEXT, content TEXT, tool_result TEXT, "
+        "PRIMARY KEY (sid, idx))"
+    )
+    return db
+
+# The connection is shared by every Streamlit session thread
+_CHAT_DB_LOCK = threading.Lock()
+
+def add_chat_message(sid: str, role: str, content: str, tool_result: str = None):
+    """Append a message to a chat session"""
+    with _CHAT_DB_LOCK:
+        get_chat_db().execute(
+            "INSERT INTO agent_messages (sid, idx, role, content, tool_result) "
+            "VALUES (?, (SELECT COALESCE(MAX(idx), -1) + 1 FROM agent_messages WHERE sid = ?), ?, ?, ?)",
+            (sid, sid, role, content, tool_result)
+        )
+
+def count_chat_messages(sid: str) -> int:
+    """Count the messages in a chat session"""
+    with _CHAT_DB_LOCK:
+        return get_chat_db().execute("SELECT COUNT(*) FROM agent_messages WHERE sid = ?", (sid,)).fetchone()[0]
+
+def load_chat_messages(sid: str, limit: int, latest: bool = True) -> List[Dict[str, Any]]:
+    """Load the latest (or earliest) messages of a chat session, oldest first"""
+    order = "DESC" if latest else "ASC"
+    with _CHAT_DB_LOCK:
+        rows = get_chat_db().execute(
+            f"SELECT role, content, tool_result FROM agent_messages WHERE sid = ? ORDER BY idx {order} LIMIT ?",
+            (sid, limit)
+        ).fetchall()
+    if latest:
+        rows.reverse()
+    return [{"role": role, "content": content, "tool_result": tool_result} for role, content, tool_result in rows]
+
+def clear_chat_messages(sid: str):
+    """Delete all messages of a chat session"""
+    with _CHAT_DB_LOCK:
+        get_chat_db().execute("DELETE FROM agent_messages WHERE sid = ?", (sid,))
+
+def render_chat_messages(messages: List[Dict[str, Any]]):
+    """Render chat bubbles"""
+    for message in messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+            if message.get("tool_result"):
+                # Display tool execution result
+                with st.expander("🔧 Tool Execution Details"):
+                    st.json(message["tool_result"])
+
 def agent_chat_tab():
     """Display the Agent chat interface with MCP tool execution"""
     st.write("🤖 **Chat with your Agent** - I have access to browser automation tools and can help you navigate the web, take screenshots, click elements, and more!")
     
     # Show available tools in an expander
     with st.expander("🔧 Available Tools", expanded=False):
+        if st.button("🔄 Refresh Tools"):
+            get_available_tools.clear()
         tools = get_available_tools()
         if tools:
             for tool in tools:
@@ -134,37 +300,37 @@ def agent_chat_tab():
         else:
             st.warning("No tools available. Make sure the backend is running.")
     
+    agent_chat_fragment()
+
+@st.fragment
+def agent_chat_fragment():
+    """Chat history and input; reruns on its own so long tool calls don't redraw the page"""
     # Initialize chat history
-    if "agent_messages" not in st.session_state:
-        st.session_state.agent_messages = []
+    if "agent_chat_sid" not in st.session_state:
+        st.session_state.agent_chat_sid = uuid.uuid4().hex
+    sid = st.session_state.agent_chat_sid
     
     # Clear conversation button
     col1, col2 = st.columns([1, 4])
     with col1:
         if st.button("Clear Chat"):
-            st.session_state.agent_messages = []
-            st.rerun()
+            clear_chat_messages(sid)
+            st.rerun(scope="fragment")
     
-    # Display chat messages
-    for message in st.session_state.agent_messages:
-        with st.chat_message(message["role"]):
-            if message["role"] == "assistant" and "tool_result" in message:
-                # Display tool execution result
-                st.markdown(message["content"])
-                with st.expander("🔧 Tool Execution Details"):
-                    st.json(message["tool_result"])
-            else:
-                st.markdown(message["content"])
+    # Display chat messages, older ones only loaded on request
+    message_count = count_chat_messages(sid)
+    if message_count > CHAT_PAGE_SIZE:
+        earlier_count = message_count - CHAT_PAGE_SIZE
+        if st.toggle(f"Show earlier messages ({earlier_count})"):
+            render_chat_messages(load_chat_messages(sid, earlier_count, latest=False))
+    render_chat_messages(load_chat_messages(sid, CHAT_PAGE_SIZE))
     
     # Chat input
     user_input = st.chat_input("Ask me to navigate websites, take screenshots, click buttons, etc.")
     
     if user_input:
         # Add user message
-        st.session_state.agent_messages.append({
-            "role": "user", 
-            "content": user_input
-        })
+        add_chat_message(sid, "user", user_input)
         
         # Display user message
         with st.chat_message("user"):
@@ -174,32 +340,35 @@ def agent_chat_tab():
         with st.chat_message("assistant"):
             with st.spinner("Processing your request..."):
                 # Parse the message for tool calls
-                tool_request = parse_tool_request(user_input)
+                tool_requests = parse_tool_requests(user_input)
                 
-                if tool_request:
-                    # Execute the tool
-                    st.write(f"🔧 Executing: **{tool_request['tool']}**")
-                    result = call_mcp_tool(tool_request['tool'], tool_request['arguments'])
-                    
-                    if result.get('success'):
-                        response = f"✅ Successfully executed **{tool_request['tool']}**!"
-                        if 'message' in result:
-                            response += f"\n\n{result['message']}"
+                if tool_requests:
+                    # Execute the tools, one backend round-trip for multi-action messages
+                    for tool_request in tool_requests:
+                        st.write(f"🔧 Executing: **{tool_request['tool']}**")
+                    if len(tool_requests) > 1 and all(r['tool'] in _READ_ONLY_TOOLS for r in tool_requests):
+                        results = call_mcp_tools_parallel(tool_requests)
+                    elif len(tool_requests) > 1:
+                        results = call_mcp_tools_batch(tool_requests)
                     else:
-                        response = f"❌ Failed to execute **{tool_request['tool']}**: {result.get('error', 'Unknown error')}"
-                    
-                    # Add assistant response with tool result
-                    st.session_state.agent_messages.append({
-                        "role": "assistant",
-                        "content": response,
-                        "tool_result": result
-                    })
-                    
-                    st.markdown(response)
+                        results = [call_mcp_tool(tool_requests[0]['tool'], tool_requests[0]['arguments'])]
                     
-                    # Show tool execution details
-                    with st.expander("🔧 Tool Execution Details"):
-                        st.json(result)
+                    for tool_request, result in zip(tool_requests, results):
+                        if result.get('success'):
+                            response = f"✅ Successfully executed **{tool_request['tool']}**!"
+                            if 'message' in result:
+                                response += f"\n\n{result['message']}"
+                        else:
+                            response = f"❌ Failed to execute **{tool_request['tool']}**: {result.get('error', 'Unknown error')}"
+                        
+                        # Add assistant response with tool result
+                        add_chat_message(sid, "assistant", response, orjson.dumps(result).decode())
+                        
+                        st.markdown(response)
+                        
+                        # Show tool execution details
+                        with st.expander("🔧 Tool Execution Details"):
+                            st.json(result)
                         
                 else:
                     # No tool recognized - provide help
@@ -213,9 +382,6 @@ def agent_chat_tab():
 
 Try asking me to do one of these actions!"""
                     
-                    st.session_state.agent_messages.append({
-                        "role": "assistant",
-                        "content": response
-                    })
+                    add_chat_message(sid, "assistant", response)
                     
                     st.markdown(response)
\ No newline at end of file
@@ -1,42 +1,77 @@
 import streamlit as st
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlsplit
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.utils import get_env_var
 
-@st.cache_data
+_PAGES_DIR = os.path.dirname(os.path.abspath(__file__))
+SITE_PAGES_SQL_PATH = os.path.join(os.path.dirname(_PAGES_DIR), "utils", "site_pages.sql")
+# Go up two levels from streamlit_pages to get to project root, then to database folder
+MARKETPLACE_SQL_PATH = os.path.join(os.path.dirname(os.path.dirname(_PAGES_DIR)), "database", "marketplace_schema.sql")
+
+def _read_sql(path):
+    """Read a SQL file, or None if it is not available"""
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+# Static templates are read once per process instead of on every rerun
+_SITE_PAGES_SQL = _read_sql(SITE_PAGES_SQL_PATH)
+_MARKETPLACE_SQL = _read_sql(MARKETPLACE_SQL_PATH)
+
 def load_sql_template():
-    """Load the SQL template file and cache it"""
-    with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils", "site_pages.sql"), "r") as f:
-        return f.read()
+    """Load the SQL template file"""
+    if _SITE_PAGES_SQL is None:
+        with open(SITE_PAGES_SQL_PATH, "r") as f:
+            return f.read()
+    return _SITE_PAGES_SQL
 
-@st.cache_data
 def load_marketplace_sql_template():
-    """Load the marketplace SQL template file and cache it"""
-    # Go up two levels from streamlit_pages to get to project root, then to database folder
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    schema_path = os.path.join(project_root, "database", "marketplace_schema.sql")
-    with open(schema_path, "r") as f:
-        return f.read()
+    """Load the marketplace SQL template file"""
+    if _MARKETPLACE_SQL is None:
+        with open(MARKETPLACE_SQL_PATH, "r") as f:
+            return f.read()
+    return _MARKETPLACE_SQL
 
+# Lets the Clear Table Data button empty site_pages with a single RPC.
+# It runs as the owner, so only the service role (the key this UI uses) may call it
+TRUNCATE_SITE_PAGES_FUNCTION_SQL = """create or replace function public.truncate_site_pages()
+returns void
+language sql
+security definer
+set search_path = public
+as $$
+  truncate table public.site_pages;
+$$;
+
+revoke execute on function public.truncate_site_pages() from public, anon, authenticated;
+grant execute on function public.truncate_site_pages() to service_role;"""
+
+@st.cache_data
+def render_site_pages_sql(vector_dim):
+    """Render the site pages SQL for the given embedding dimensions"""
+    # A single pass covers the column type and the match_site_pages argument
+    sql = load_sql_template().replace("vector(1536)", f"vector({vector_dim})")
+    return f"{sql.rstrip()}\n\n{TRUNCATE_SITE_PAGES_FUNCTION_SQL}\n"
+
+@lru_cache(maxsize=4)
 def get_supabase_sql_editor_url(supabase_url):
     """Get the URL for the Supabase SQL Editor"""
-    try:
-        # Extract the project reference from the URL
-        # Format is typically: https://<project-ref>.supabase.co
-        if '//' in supabase_url and 'supabase' in supabase_url:
-            parts = supabase_url.split('//')
-            if len(parts) > 1:
-                domain_parts = parts[1].split('.')
-                if len(domain_parts) > 0:
-                    project_ref = domain_parts[0]
-                    return f"https://supabase.com/dashboard/project/{project_ref}/sql/new"
-        
-        # Fallback to a generic URL
-        return "https://supabase.com/dashboard"
-    except Exception:
-        return "https://supabase.com/dashboard"
+    # Extract the project reference from the URL
+    # Format is typically: https://<project-ref>.supabase.co
+    host = urlsplit(supabase_url).hostname or ""
+    if host.endswith(".supabase.co"):
+        project_ref = host.split(".", 1)[0]
+        return f"https://supabase.com/dashboard/project/{project_ref}/sql/new"
+    
+    # Fallback to a generic URL
+    return "https://supabase.com/dashboard"
 
 def show_manual_sql_instructions(sql, vector_dim, recreate=False):
     """Show instructions for manually executing SQL in Supabase"""
@@ -65,20 +100,41 @@ def show_manual_sql_instructions(sql, vector_dim, recreate=False):
     
     st.success("After executing the SQL, return to this page and refresh to see the updated table status.")
 
-def check_marketplace_tables(supabase):
+MARKETPLACE_TABLES = ['marketplace_servers', 'user_server_installations', 'server_reviews', 'server_content_pages', 'crawl_sessions']
+
+@st.cache_data(ttl=30, show_spinner=False)
+def check_marketplace_tables(_supabase):
     """Check if marketplace tables exist in the database"""
-    if not supabase:
+    if not _supabase:
         return False
     
-    required_tables = ['marketplace_servers', 'user_server_installations', 'server_reviews', 'server_content_pages', 'crawl_sessions']
+    def table_exists(table):
+        # Try to query the table to see if it exists
+        try:
+            _supabase.table(table).select("*").limit(1).execute()
+            return True
+        except Exception:
+            return False
     
-    try:
-        for table in required_tables:
-            # Try to query each table to see if it exists
-            supabase.table(table).select("*").limit(1).execute()
-        return True
-    except Exception:
-        return False
+    # Probe all tables at once rather than one round-trip after another
+    with ThreadPoolExecutor(max_workers=len(MARKETPLACE_TABLES)) as executor:
+        return all(executor.map(table_exists, MARKETPLACE_TABLES))
+
+@st.cache_data(ttl=15, show_spinner=False)
+def fetch_marketplace_stats(_supabase):
+    """Fetch marketplace table counts and a few sample servers concurrently"""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        servers = executor.submit(lambda: _supabase.table("marketplace_servers").select("*", count="exact").execute())
+        installations = executor.submit(lambda: _supabase.table("user_server_installations").select("*", count="exact").execute())
+        reviews = executor.submit(lambda: _supabase.table("server_reviews").select("*", count="exact").execute())
+        samples = executor.submit(lambda: _supabase.table("marketplace_servers").select("name, category, description").limit(5).execute())
+        
+        return {
+            "servers_count": servers.result().count,
+            "installations_count": installations.result().count,
+            "reviews_count": reviews.result().count,
+            "sample_servers": samples.result().data or []
+        }
 
 def show_marketplace_table_stats(supabase):
     """Show statistics about marketplace tables"""
@@ -87,9 +143,8 @@ def show_marketplace_table_stats(supabase):
     
     try:
         # Get counts for each table
-        servers_count = supabase.table("marketplace_servers").select("*", count="exact").execute().count
-        installations_count = supabase.table("user_server_installations").select("*", count="exact").execute().count
-        reviews_count = supabase.table("server_reviews").select("*", count="exact").execute().count
+        stats = fetch_marketplace_stats(supabase)
+        servers_count = stats["servers_count"]
         
         col1, col2, col3 = st.columns(3)
         
@@ -97,17 +152,16 @@ def show_marketplace_table_stats(supabase):
             st.metric("Total Servers", servers_count or 0)
         
         with col2:
-            st.metric("Total Installations", installations_count or 0)
+            st.metric("Total Installations", stats["installations_count"] or 0)
         
         with col3:
-            st.metric("Total Reviews", reviews_count or 0)
+            st.metric("Total Reviews", stats["reviews_count"] or 0)
             
         # Show sample servers if any exist
         if servers_count and servers_count > 0:
             st.write("### Sample Servers")
-            servers_response = supabase.table("marketplace_servers").select("name, category, description").limit(5).execute()
-            if servers_response.data:
-                for server in servers_response.data:
+            if stats["sample_servers"]:
+                for server in stats["sample_servers"]:
                     with st.expander(f"🔧 {server['name']} ({server.get('category', 'Unknown')})"):
                         st.write(server.get('description', 'No description available.'))
     except Exception as e:
@@ -188,13 +242,7 @@ def database_tab(supabase):
     )
     
     # Get the SQL with the selected vector dimensions
-    sql_template = load_sql_template()
-    
-    # Replace the vector dimensions in the SQL
-    sql = sql_template.replace("vector(1536)", f"vector({vector_dim})")
-    
-    # Also update the match_site_pages function dimensions
-    sql = sql.replace("query_embedding vector(1536)", f"query_embedding vector({vector_dim})")
+    sql = render_site_pages_sql(vector_dim)
     
     # Show the SQL
     with st.expander("View SQL", expanded=False):
@@ -219,8 +267,8 @@ def database_tab(supabase):
                 if st.button("Clear Table Data"):
                     try:
                         with st.spinner("Clearing table data..."):
-                            # Use the Supabase client to delete all rows
-                            response = supabase.table("site_pages").delete().neq("id", 0).execute()
+                            # Truncate server-side in one statement instead of a PostgREST delete
+                            supabase.rpc("truncate_site_pages").execute()
                             st.success("✅ Table data cleared successfully!")
                             st.rerun()
                     except Exception as e:
@@ -229,6 +277,8 @@ def database_tab(supabase):
                         truncate_sql = "TRUNCATE TABLE site_pages;"
                         st.code(truncate_sql, language="sql")
                         st.info("Execute this SQL in your Supabase SQL Editor to clear the table data.")
+                        st.write("To enable one-click clearing, also create the truncate function:")
+                        st.code(TRUNCATE_SITE_PAGES_FUNCTION_SQL, language="sql")
                         
                         # Provide a link to the Supabase SQL Editor
                         supabase_url = get_env_var("SUPABASE_URL")
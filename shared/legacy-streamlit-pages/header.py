@@ -1,8 +1,7 @@
+import re
 import streamlit as st
 
-def show_header():
-    """Display a cool animated header for MyMCP.me"""
-    st.markdown("""
+_HEADER_HTML_RAW = """
         <div style="text-align: center; padding: 2rem 0; margin-bottom: 2rem;">
             <div style="
                 background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 50%, #06b6d4 100%);
@@ -74,4 +73,11 @@ def show_header():
             }
         }
         </style>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """
+
+# Collapse whitespace once at import so every rerun sends the compact markup
+_HEADER_HTML = re.sub(r"\s+", " ", _HEADER_HTML_RAW).strip()
+
+def show_header():
+    """Display a cool animated header for MyMCP.me"""
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
@@ -1,16 +1,77 @@
 import streamlit as st
 import sys
 import os
+import html
 import requests
 import uuid
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, List
+from urllib3.util.retry import Retry
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.utils import get_env_var
+from streamlit_pages.script_context import with_script_run_ctx
 
 # Backend API configuration
-BACKEND_API_URL = "http://localhost:8100"
+BACKEND_API_URL = get_env_var("BACKEND_API_URL") or "http://localhost:8100"
+
+# Shared pool for independent Supabase/backend calls
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Installs run off the script thread; kept apart from _EXECUTOR so slow
+# backend installs can't hold up page reads
+_INSTALL_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# Seconds between reruns while an install is still running
+INSTALL_POLL_INTERVAL = 0.5
+
+# In-flight installs keyed by (user_id, server_id), shared by duplicate clicks
+_INFLIGHT: Dict[tuple, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# Pooled backend session so setup checks and installs reuse connections
+_HTTP = requests.Session()
+_HTTP.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+))
+
+# Columns rendered by show_server_card, so browsing doesn't pull full rows
+SERVER_CARD_COLUMNS = "id,name,description,category,tags,logo_url,featured"
+
+# SEO page fields needed for the documentation buttons; content loads on open
+SEO_PAGE_COLUMNS = "id,server_id,page_type,title"
+
+# Server cards per browse page
+BROWSE_PAGE_SIZE = 20
+
+def ilike_pattern(term: str) -> str:
+    """Quote a search term as a PostgREST substring pattern for ilike"""
+    # Escape LIKE wildcards, then quote so commas and parentheses
+    # can't break out of the or_() filter
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    escaped = escaped.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"%{escaped}%"'
+
+def apply_server_filters(query, search: Optional[str], category: Optional[str]):
+    """Add the browse tab's category and search filters to a marketplace_servers query"""
+    if category and category != "All":
+        query = query.eq("category", category)
+    
+    if search:
+        pattern = ilike_pattern(search)
+        query = query.or_(f"name.ilike.{pattern},description.ilike.{pattern}")
+    
+    return query
+
+def logo_html(logo_url: str, width: int) -> str:
+    """Lazy-loading <img> tag so the browser fetches logos directly"""
+    return f'<img src="{html.escape(logo_url)}" width="{width}" loading="lazy"/>'
 
 def get_or_create_user_id() -> str:
     """Get or create a UUID-based user ID for the current session"""
@@ -18,136 +79,224 @@ def get_or_create_user_id() -> str:
         st.session_state.user_id = str(uuid.uuid4())
     return st.session_state.user_id
 
-def get_installed_servers(supabase) -> List[Dict]:
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_installed_servers(user_id: str, _supabase) -> List[Dict]:
+    """Fetch a user's installed servers, cached briefly across reruns"""
+    response = _supabase.table("user_server_installations")\
+        .select("*, marketplace_servers(*)")\
+        .eq("user_id", user_id)\
+        .eq("status", "installed")\
+        .execute()
+    
+    return response.data or []
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_installed_server_ids(user_id: str, _supabase) -> set:
+    """Fetch the ids of a user's installed servers in one query"""
+    response = _supabase.table("user_server_installations")\
+        .select("server_id")\
+        .eq("user_id", user_id)\
+        .eq("status", "installed")\
+        .execute()
+    
+    return {row["server_id"] for row in response.data or []}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_available_servers(_supabase, search: Optional[str] = None, category: Optional[str] = None,
+                            columns: str = "*") -> List[Dict]:
+    """Fetch active marketplace servers matching the filters, cached briefly across reruns"""
+    query = _supabase.table("marketplace_servers")\
+        .select(columns)\
+        .eq("status", "active")
+    
+    query = apply_server_filters(query, search, category)
+    
+    response = query\
+        .order("featured", desc=True)\
+        .order("name")\
+        .execute()
+    
+    return response.data or []
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_available_servers_page(_supabase, search: Optional[str], category: Optional[str], columns: str,
+                                 page: int, page_size: int) -> tuple:
+    """Fetch one page of matching servers plus the total match count"""
+    query = _supabase.table("marketplace_servers")\
+        .select(columns, count="exact")\
+        .eq("status", "active")
+    
+    query = apply_server_filters(query, search, category)
+    
+    response = query\
+        .order("featured", desc=True)\
+        .order("name")\
+        .range(page * page_size, (page + 1) * page_size - 1)\
+        .execute()
+    
+    rows = response.data or []
+    return rows, response.count if response.count is not None else len(rows)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_seo_pages_bulk(server_ids: tuple, _supabase) -> Dict[str, List[Dict]]:
+    """Fetch published SEO pages for many servers in one query, grouped by server id"""
+    pages_by_server = {server_id: [] for server_id in server_ids}
+    if not server_ids:
+        return pages_by_server
+    
+    response = _supabase.table("server_content_pages")\
+        .select(SEO_PAGE_COLUMNS)\
+        .in_("server_id", list(server_ids))\
+        .eq("published", True)\
+        .order("page_type")\
+        .execute()
+    
+    for page in response.data or []:
+        pages_by_server.setdefault(page["server_id"], []).append(page)
+    return pages_by_server
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_seo_page_content(page_id: str, _supabase) -> str:
+    """Fetch the markdown body of one SEO page"""
+    response = _supabase.table("server_content_pages")\
+        .select("content")\
+        .eq("id", page_id)\
+        .maybe_single()\
+        .execute()
+    
+    # maybe_single() yields no response at all when the row is missing
+    if not response or not response.data:
+        return ""
+    return response.data.get("content") or ""
+
+def invalidate_installed_servers():
+    """Drop cached installation data after a write"""
+    fetch_installed_servers.clear()
+    fetch_installed_server_ids.clear()
+
+def get_installed_servers(user_id: str, supabase) -> List[Dict]:
     """Get list of servers installed by the current user"""
     if not supabase:
         return []
     
     try:
-        user_id = get_or_create_user_id()
-        
-        response = supabase.table("user_server_installations")\
-            .select("*, marketplace_servers(*)")\
-            .eq("user_id", user_id)\
-            .eq("status", "installed")\
-            .execute()
-        
-        return response.data or []
+        return fetch_installed_servers(user_id, supabase)
     except Exception as e:
         st.error(f"Error fetching installed servers: {str(e)}")
         return []
 
-def get_available_servers(supabase) -> List[Dict]:
-    """Get list of all available servers from marketplace"""
+def get_installed_server_ids(user_id: str, supabase, future: Optional[Future] = None) -> set:
+    """Get the ids of servers installed by the current user, optionally from a prefetch future"""
+    if not supabase:
+        return set()
+    
+    try:
+        if future is not None:
+            return future.result()
+        return fetch_installed_server_ids(user_id, supabase)
+    except Exception as e:
+        st.error(f"Error fetching installed servers: {str(e)}")
+        return set()
+
+def get_available_servers(supabase, search: Optional[str] = None, category: Optional[str] = None,
+                          columns: str = "*") -> List[Dict]:
+    """Get list of available servers from marketplace, filtered in the database"""
     if not supabase:
         st.error("Supabase client not available")
         return []
     
     try:
-        response = supabase.table("marketplace_servers")\
-            .select("*")\
-            .eq("status", "active")\
-            .order("featured", desc=True)\
-            .order("name")\
-            .execute()
-        
-        return response.data or []
+        return fetch_available_servers(supabase, search or None, category, columns)
     except Exception as e:
         st.error(f"Error fetching available servers: {str(e)}")
         return []
 
-def get_server_seo_pages(server_id: str, supabase) -> List[Dict]:
-    """Get SEO content pages for a server"""
+def get_available_servers_page(supabase, search: Optional[str], category: Optional[str], page: int,
+                               page_size: int = BROWSE_PAGE_SIZE, columns: str = SERVER_CARD_COLUMNS) -> tuple:
+    """Get one page of marketplace servers and the total number of matches"""
     if not supabase:
-        return []
+        st.error("Supabase client not available")
+        return [], 0
     
     try:
-        response = supabase.table("server_content_pages")\
-            .select("*")\
-            .eq("server_id", server_id)\
-            .eq("published", True)\
-            .order("page_type")\
-            .execute()
-        
-        return response.data or []
+        return fetch_available_servers_page(supabase, search or None, category, columns, page, page_size)
+    except Exception as e:
+        st.error(f"Error fetching available servers: {str(e)}")
+        return [], 0
+
+def get_seo_pages_bulk(server_ids: List[str], supabase) -> Dict[str, List[Dict]]:
+    """Get SEO content pages for several servers, keyed by server id"""
+    if not supabase:
+        return {}
+    
+    try:
+        return fetch_seo_pages_bulk(tuple(server_ids), supabase)
     except Exception as e:
         st.error(f"Error fetching SEO pages: {str(e)}")
-        return []
+        return {}
+
+def get_server_seo_pages(server_id: str, supabase) -> List[Dict]:
+    """Get SEO content pages for a server"""
+    return get_seo_pages_bulk([server_id], supabase).get(server_id, [])
 
-def install_server(server_id: str, supabase) -> bool:
-    """Install a server for the current user with backend integration"""
+def get_seo_page_content(page_id: str, supabase) -> str:
+    """Get the content of an SEO page that was opened"""
     if not supabase:
-        return False
+        return ""
     
     try:
-        import requests
-        
-        user_id = get_or_create_user_id()
-        
-        # Check if already installed
-        existing = supabase.table("user_server_installations")\
-            .select("id")\
-            .eq("user_id", user_id)\
-            .eq("server_id", server_id)\
-            .execute()
-        
-        if existing.data:
-            st.warning("Server is already installed!")
-            return False
-        
-        # Get server details to find the server name
+        return fetch_seo_page_content(page_id, supabase)
+    except Exception as e:
+        st.error(f"Error fetching SEO page: {str(e)}")
+        return ""
+
+def run_install(server_id: str, user_id: str, supabase) -> Dict:
+    """Install a server for a user; returns an outcome dict instead of rendering"""
+    try:
+        # Get server details and this user's existing installation in one request
         server_data = supabase.table("marketplace_servers")\
-            .select("*")\
+            .select("id,name,server_key,user_server_installations(id)")\
             .eq("id", server_id)\
+            .eq("user_server_installations.user_id", user_id)\
+            .limit(1, foreign_table="user_server_installations")\
+            .maybe_single()\
             .execute()
         
-        if not server_data.data:
-            st.error("Server not found in marketplace")
-            return False
+        # maybe_single() yields no response at all when the row is missing
+        if not server_data or not server_data.data:
+            return {"status": "error", "error": "Server not found in marketplace"}
         
-        server = server_data.data[0]
-        server_name = server.get('server_key', server.get('name', '').lower().replace(' ', '-'))
+        server = server_data.data
+        if server.pop("user_server_installations", None):
+            return {"status": "already_installed"}
         
-        # Check setup requirements first
-        try:
-            setup_response = requests.get(f"http://localhost:8100/setup/{server_name}", timeout=5)
-            if setup_response.status_code == 200:
-                setup_info = setup_response.json()
-                
-                # Check if server needs setup and doesn't have credentials
-                if setup_info.get('requirements'):
-                    st.warning(f"⚙️ **Setup Required**: {server['name']} needs configuration before installation.")
-                    st.info("💡 Please visit the **Setup** page to configure API keys and credentials first.")
-                    
-                    # Show setup requirements
-                    with st.expander("📋 Setup Requirements", expanded=True):
-                        for req in setup_info['requirements']:
-                            st.write(f"• **{req.get('name', 'Unknown')}**: {req.get('description', 'No description')}")
-                    
-                    return False
-        except requests.RequestException:
-            # If setup check fails, continue with installation (server may not need setup)
-            pass
+        server_name = server.get('server_key', server.get('name', '').lower().replace(' ', '-'))
         
-        # Install server via backend (creates MCP agent)
+        # Install server via backend (creates MCP agent); the backend refuses
+        # with 409 when the server still needs setup, so one request does both
         try:
-            install_response = requests.post(
-                "http://localhost:8100/servers/install",
-                json={"serverName": server_name},
+            install_response = _HTTP.post(
+                f"{BACKEND_API_URL}/servers/install",
+                json={"serverName": server_name, "precheck": True},
                 timeout=30
             )
             
+            if install_response.status_code == 409:
+                return {
+                    "status": "setup_required",
+                    "server": server,
+                    "missing_requirements": install_response.json().get('missingRequirements', [])
+                }
+            
             if install_response.status_code != 200:
                 error_data = install_response.json() if install_response.headers.get('content-type') == 'application/json' else {}
-                st.error(f"❌ Failed to install server: {error_data.get('error', 'Unknown backend error')}")
-                return False
+                return {"status": "error", "error": f"❌ Failed to install server: {error_data.get('error', 'Unknown backend error')}"}
             
             backend_result = install_response.json()
             backend_server_id = backend_result.get('serverId')
             
         except requests.RequestException as e:
-            st.error(f"❌ Cannot connect to backend: {str(e)}. Make sure the backend is running.")
-            return False
+            return {"status": "error", "error": f"❌ Cannot connect to backend: {str(e)}. Make sure the backend is running."}
         
         # If backend installation successful, create database record
         result = supabase.table("user_server_installations").insert({
@@ -162,35 +311,77 @@ def install_server(server_id: str, supabase) -> bool:
         }).execute()
         
         if result.data:
-            st.success(f"✅ Successfully installed **{server['name']}** as MCP agent!")
-            st.info("💡 The server and its tools are now available in the Tools page.")
-            return True
+            invalidate_installed_servers()
+            return {"status": "installed", "server": server}
         else:
-            st.error("❌ Failed to create installation record")
-            return False
+            return {"status": "error", "error": "❌ Failed to create installation record"}
         
     except Exception as e:
-        st.error(f"Error installing server: {str(e)}")
-        return False
+        return {"status": "error", "error": f"Error installing server: {str(e)}"}
 
-def is_server_installed(server_id: str, supabase) -> bool:
-    """Check if a server is already installed by the current user"""
-    if not supabase:
-        return False
+def release_install(key: tuple):
+    """Forget a finished install so the next click starts a fresh one"""
+    with _INFLIGHT_LOCK:
+        _INFLIGHT.pop(key, None)
+
+def start_install(server_id: str, user_id: str, supabase) -> Future:
+    """Run an install in the background; duplicate clicks share the running future"""
+    key = (user_id, server_id)
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = _INFLIGHT[key] = _INSTALL_EXECUTOR.submit(run_install, server_id, user_id, supabase)
     
-    try:
-        user_id = get_or_create_user_id()
-        existing = supabase.table("user_server_installations")\
-            .select("id")\
-            .eq("user_id", user_id)\
-            .eq("server_id", server_id)\
-            .eq("status", "installed")\
-            .execute()
-        return bool(existing.data)
-    except:
-        return False
+    # Registered outside the lock: the callback runs inline if the install already finished
+    if owner:
+        future.add_done_callback(lambda _: release_install(key))
+    return future
 
-def show_server_card(server: Dict, supabase, is_installed: bool = False):
+def request_install(server_id: str, user_id: str, supabase):
+    """Button callback: start an install and remember its future for polling"""
+    if supabase:
+        st.session_state[f"install_fut_{server_id}"] = start_install(server_id, user_id, supabase)
+
+def show_install_progress() -> bool:
+    """Render finished installs and a status for running ones; True while any are running"""
+    running = False
+    for key in [k for k in st.session_state.keys() if k.startswith("install_fut_")]:
+        future = st.session_state[key]
+        if future.done():
+            del st.session_state[key]
+            show_install_outcome(future.result())
+        else:
+            running = True
+    
+    if running:
+        st.status("Installing server...", state="running")
+    return running
+
+def show_install_outcome(outcome: Dict) -> bool:
+    """Render the result of run_install; True when the server was installed"""
+    status = outcome["status"]
+    
+    if status == "installed":
+        st.success(f"✅ Successfully installed **{outcome['server']['name']}** as MCP agent!")
+        st.info("💡 The server and its tools are now available in the Tools page.")
+        return True
+    
+    if status == "already_installed":
+        st.warning("Server is already installed!")
+    elif status == "setup_required":
+        st.warning(f"⚙️ **Setup Required**: {outcome['server']['name']} needs configuration before installation.")
+        st.info("💡 Please visit the **Setup** page to configure API keys and credentials first.")
+        
+        # Show setup requirements
+        with st.expander("📋 Setup Requirements", expanded=True):
+            for req in outcome['missing_requirements']:
+                st.write(f"• **{req.get('name', 'Unknown')}**: {req.get('description', 'No description')}")
+    else:
+        st.error(outcome["error"])
+    return False
+
+def show_server_card(server: Dict, supabase, is_installed: bool = False, seo_pages: Optional[List[Dict]] = None):
     """Display a server card with installation button and SEO links"""
     with st.container():
         col1, col2, col3 = st.columns([1, 3, 1])
@@ -198,24 +389,27 @@ def show_server_card(server: Dict, supabase, is_installed: bool = False):
         with col1:
             # Show logo or placeholder
             if server.get('logo_url'):
-                st.image(server['logo_url'], width=60)
+                st.markdown(logo_html(server['logo_url'], 60), unsafe_allow_html=True)
             else:
                 st.write("🔧")
         
         with col2:
-            st.subheader(server['name'])
-            st.write(server.get('description', 'No description available.'))
-            
-            # Show category and tags
-            category = server.get('category', 'Unknown')
-            st.caption(f"Category: {category}")
+            # Name, description, category and tags as one markdown element
+            card_lines = [
+                f"### {server['name']}",
+                server.get('description') or 'No description available.',
+                f":gray[Category: {server.get('category', 'Unknown')}]"
+            ]
             
             if server.get('tags'):
                 tags = ", ".join(server['tags'][:3])  # Show first 3 tags
-                st.caption(f"Tags: {tags}")
+                card_lines.append(f":gray[Tags: {tags}]")
+            
+            st.markdown("\n\n".join(card_lines))
             
             # Add SEO page links
-            seo_pages = get_server_seo_pages(server['id'], supabase)
+            if seo_pages is None:
+                seo_pages = get_server_seo_pages(server['id'], supabase)
             if seo_pages:
                 st.write("📄 **Documentation:**")
                 doc_cols = st.columns(len(seo_pages))
@@ -226,32 +420,33 @@ def show_server_card(server: Dict, supabase, is_installed: bool = False):
                             st.rerun()
         
         with col3:
-            # Check if server is already installed
-            already_installed = is_server_installed(server['id'], supabase)
-            
-            if already_installed:
+            if is_installed:
                 st.success("✅ Installed")
+            elif f"install_fut_{server['id']}" in st.session_state:
+                # Already clicked: keep the button disabled while the install runs
+                st.button("Installing...", key=f"install_{server['id']}", disabled=True)
             else:
-                if st.button(f"Install", key=f"install_{server['id']}"):
-                    return server['id']
+                st.button(f"Install", key=f"install_{server['id']}", on_click=request_install,
+                          args=(server['id'], get_or_create_user_id(), supabase))
     
     # Show SEO content if requested
+    pages_by_type = {p['page_type']: p for p in seo_pages}
     for page_type in ['overview', 'setup', 'api-reference']:
         show_key = f"show_page_{server['id']}_{page_type}"
         if st.session_state.get(show_key, False):
-            seo_page = next((p for p in seo_pages if p['page_type'] == page_type), None)
+            seo_page = pages_by_type.get(page_type)
             if seo_page:
                 with st.expander(f"📖 {seo_page['title']}", expanded=True):
-                    st.markdown(seo_page['content'])
+                    st.markdown(get_seo_page_content(seo_page['id'], supabase))
                     if st.button("Close", key=f"close_{server['id']}_{page_type}"):
                         st.session_state[show_key] = False
                         st.rerun()
     
     st.divider()
-    return None
 
 def browse_servers_tab(supabase):
     """Browse all available servers"""
+    user_id = get_or_create_user_id()
     st.header("🏪 Browse MCP Servers")
     
     # Search and filter options
@@ -263,40 +458,59 @@ def browse_servers_tab(supabase):
     with col2:
         category_filter = st.selectbox("Category", ["All", "development", "communication", "database", "search", "finance"])
     
-    # Get available servers
-    servers = get_available_servers(supabase)
+    # The installed ids don't depend on the filters, so fetch them alongside the servers
+    installed_future = _EXECUTOR.submit(with_script_run_ctx(fetch_installed_server_ids), user_id, supabase) if supabase else None
     
-    if not servers:
-        st.info("No servers available yet. The marketplace tables may need to be set up in the Database tab.")
-        return
+    # Start from the first page whenever the filters change
+    filters = (search_term.strip(), category_filter)
+    if st.session_state.get("marketplace_filters") != filters:
+        st.session_state.marketplace_filters = filters
+        st.session_state.marketplace_page = 0
+    page = st.session_state.get("marketplace_page", 0)
     
-    # Filter servers based on search and category
-    filtered_servers = servers
+    # Get one page of servers, filtered by search and category in the database
+    filtered_servers, total = get_available_servers_page(supabase, filters[0], category_filter, page)
     
-    if search_term:
-        filtered_servers = [s for s in filtered_servers 
-                          if search_term.lower() in s['name'].lower() 
-                          or search_term.lower() in s.get('description', '').lower()]
+    if not total and not search_term and category_filter == "All":
+        st.info("No servers available yet. The marketplace tables may need to be set up in the Database tab.")
+        return
     
-    if category_filter != "All":
-        filtered_servers = [s for s in filtered_servers if s.get('category') == category_filter]
+    page_count = max(1, -(-total // BROWSE_PAGE_SIZE))
+    st.write(f"Found {total} servers")
     
-    st.write(f"Found {len(filtered_servers)} servers")
+    # One lookup for every card instead of queries per server
+    installed_ids = get_installed_server_ids(user_id, supabase, installed_future)
+    seo_by_id = get_seo_pages_bulk([s['id'] for s in filtered_servers], supabase)
     
     # Display servers
     for server in filtered_servers:
-        server_to_install = show_server_card(server, supabase)
-        if server_to_install:
-            with st.spinner("Installing server..."):
-                if install_server(server_to_install, supabase):
-                    st.success(f"Successfully installed {server['name']}!")
-                    st.rerun()
+        show_server_card(
+            server,
+            supabase,
+            is_installed=server['id'] in installed_ids,
+            seo_pages=seo_by_id.get(server['id'], [])
+        )
+    
+    # Page navigation
+    if page_count > 1:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if st.button("← Prev", key="marketplace_prev", disabled=page == 0):
+                st.session_state.marketplace_page = page - 1
+                st.rerun()
+        with info_col:
+            st.caption(f"Page {page + 1} of {page_count}")
+        with next_col:
+            if st.button("Next →", key="marketplace_next", disabled=page >= page_count - 1):
+                st.session_state.marketplace_page = page + 1
+                st.rerun()
 
 def installed_servers_tab(supabase):
     """Show installed servers"""
+    user_id = get_or_create_user_id()
     st.header("🔧 Your Installed Servers")
     
-    installed = get_installed_servers(supabase)
+    installed = get_installed_servers(user_id, supabase)
     
     if not installed:
         st.info("You haven't installed any servers yet. Browse the marketplace to find servers to install.")
@@ -339,6 +553,7 @@ def installed_servers_tab(supabase):
 
 def server_detail_tab(supabase):
     """Show detailed server information"""
+    user_id = get_or_create_user_id()
     st.header("📖 Server Details")
     
     # Server selection
@@ -358,7 +573,7 @@ def server_detail_tab(supabase):
         
         with col1:
             if server.get('logo_url'):
-                st.image(server['logo_url'], width=100)
+                st.markdown(logo_html(server['logo_url'], 100), unsafe_allow_html=True)
             else:
                 st.write("🔧")
         
@@ -382,12 +597,12 @@ def server_detail_tab(supabase):
         # Check if we should show SEO content
         show_seo_key = f"show_seo_{server['id']}"
         if show_seo_key in st.session_state:
-            page_type = st.session_state[show_seo_key]
-            seo_page = next((p for p in seo_pages if p['page_type'] == page_type), None)
+            pages_by_type = {p['page_type']: p for p in seo_pages}
+            seo_page = pages_by_type.get(st.session_state[show_seo_key])
             if seo_page:
                 st.markdown("---")
                 st.subheader(f"📖 {seo_page['title']}")
-                st.markdown(seo_page['content'])
+                st.markdown(get_seo_page_content(seo_page['id'], supabase))
                 if st.button("← Back to Server Details", key=f"back_{server['id']}"):
                     del st.session_state[show_seo_key]
                     st.rerun()
@@ -427,10 +642,9 @@ def server_detail_tab(supabase):
                 st.code(f"docker run {server['docker_image']}", language="bash")
             
             # One-click install button
-            if st.button("Install Server", key=f"detail_install_{server['id']}"):
-                with st.spinner("Installing..."):
-                    if install_server(server['id'], supabase):
-                        st.success("Server installed successfully!")
+            st.button("Install Server", key=f"detail_install_{server['id']}",
+                      disabled=f"install_fut_{server['id']}" in st.session_state,
+                      on_click=request_install, args=(server['id'], user_id, supabase))
         
         elif detail_tab == "Tools":
             st.subheader("Available Tools")
@@ -476,16 +690,20 @@ def marketplace_tab(supabase):
     # Initialize user session with proper UUID
     user_id = get_or_create_user_id()
     
-    # Sub-navigation
-    tab_option = st.selectbox(
-        "Choose marketplace section:",
-        ["Browse Servers", "Your Installed Servers", "Server Details"],
-        key="marketplace_tab_selection"
-    )
+    # Installs run in the background; report any that finished since the last run
+    installing = show_install_progress()
+    
+    # Sub-navigation; switching tabs happens client-side without a rerun
+    browse_tab, installed_tab, details_tab = st.tabs(["Browse Servers", "Your Installed Servers", "Server Details"])
     
-    if tab_option == "Browse Servers":
+    with browse_tab:
         browse_servers_tab(supabase)
-    elif tab_option == "Your Installed Servers":
+    with installed_tab:
         installed_servers_tab(supabase)
-    elif tab_option == "Server Details":
-        server_detail_tab(supabase)
\ No newline at end of file
+    with details_tab:
+        server_detail_tab(supabase)
+    
+    # Poll until the running installs finish
+    if installing:
+        time.sleep(INSTALL_POLL_INTERVAL)
+        st.rerun()
@@ -1,10 +1,29 @@
 import streamlit as st
 import requests
+import ast
 import json
 import os
-import glob
-import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, List, Optional
+from urllib3.util.retry import Retry
+
+from streamlit_pages.script_context import with_script_run_ctx
+
+# Runs the independent backend fetches side by side
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# Server start/stop requests run here so the page stays responsive
+_ACTION_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# Last recorder tool scan; reused while the directory mtime is unchanged,
+# rescanning at most every RECORDER_RESCAN_INTERVAL seconds for in-place edits
+RECORDER_RESCAN_INTERVAL = 10
+_RECORDER_SCAN = {'mtime': None, 'at': 0.0, 'tools': []}
+_RECORDER_SCAN_LOCK = threading.Lock()
 
 def get_mcp_server_url():
     """Get the local MCP server URL"""
@@ -14,145 +33,310 @@ def get_backend_api_url():
     """Get the backend API URL"""
     return "http://localhost:8100"
 
-def generate_mcp_config_for_ide(ide_type, mcp_url):
-    """Generate simplified MCP configuration for different IDEs"""
-    if ide_type == "Windsurf":
-        return {
-            "mcpServers": {
-                "mymcp": {
-                    "command": "curl",
-                    "args": [mcp_url]
-                }
+# IDE name -> builder for its MCP configuration
+IDE_CONFIGS = {
+    "Windsurf": lambda mcp_url: {
+        "mcpServers": {
+            "mymcp": {
+                "command": "curl",
+                "args": [mcp_url]
             }
         }
-    elif ide_type == "Cursor":
-        return f"Connect to: {mcp_url}"
-    elif ide_type == "Cline/Roo Code":
-        return {
-            "mcpServers": {
-                "mymcp": {
-                    "url": mcp_url
-                }
+    },
+    "Cursor": lambda mcp_url: f"Connect to: {mcp_url}",
+    "Cline/Roo Code": lambda mcp_url: {
+        "mcpServers": {
+            "mymcp": {
+                "url": mcp_url
             }
         }
-    elif ide_type == "Claude Code":
-        return f"claude mcp add MyMCP {mcp_url}"
-    else:
-        return f"Connect your IDE to: {mcp_url}"
+    },
+    "Claude Code": lambda mcp_url: f"claude mcp add MyMCP {mcp_url}",
+}
 
-def fetch_installed_servers():
-    """Fetch installed marketplace servers from backend"""
+def generate_mcp_config_for_ide(ide_type, mcp_url):
+    """Generate simplified MCP configuration for different IDEs"""
+    builder = IDE_CONFIGS.get(ide_type)
+    return builder(mcp_url) if builder else f"Connect your IDE to: {mcp_url}"
+
+@st.cache_data(show_spinner=False)
+def render_ide_config(ide_type, mcp_url):
+    """IDE configuration as display text plus its code language, serialized once per IDE"""
+    ide_config = generate_mcp_config_for_ide(ide_type, mcp_url)
+    if isinstance(ide_config, dict):
+        return json.dumps(ide_config, indent=2), "json"
+    return ide_config, "text"
+
+@st.cache_resource
+def get_session():
+    """Shared backend session; one keep-alive pool per server process, surviving reruns and reloads"""
+    session = requests.Session()
+    # Brief backend hiccups on GETs are retried instead of failing the page; a 5xx that persists
+    # comes back as the last response, so get_json treats it like any other non-200 reply
+    session.mount("http://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=1, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+    ))
+    return session
+
+def get_json(path, timeout=5):
+    """GET a backend path; returns (data, error), with data None on a non-200 reply"""
     try:
-        backend_url = get_backend_api_url()
-        response = requests.get(f"{backend_url}/servers", timeout=5)
-        if response.status_code == 200:
-            servers_data = response.json().get('servers', [])
-            return [server for server in servers_data if server.get('status') in ['running', 'stopped']]
-        else:
-            return []
+        response = get_session().get(f"{get_backend_api_url()}{path}", timeout=timeout)
+        if response.status_code != 200:
+            return None, None
+        return response.json(), None
     except Exception as e:
-        st.error(f"Could not fetch installed servers: {str(e)}")
-        return []
+        return None, str(e)
+
+@st.cache_data(ttl=10, show_spinner=False)
+def fetch_installed_servers():
+    """Fetch installed marketplace servers from backend; returns (servers, error)"""
+    data, error = get_json("/servers")
+    if error:
+        return [], f"Could not fetch installed servers: {error}"
+    
+    servers_data = (data or {}).get('servers', [])
+    servers = [server for server in servers_data if server.get('status') in ['running', 'stopped']]
+    
+    # Widget keys are built once here rather than on every rerun
+    for server in servers:
+        server['_start_key'] = f"start_{server['id']}"
+        server['_stop_key'] = f"stop_{server['id']}"
+    return servers, None
 
+@st.cache_data(ttl=10, show_spinner=False)
 def fetch_available_tools():
-    """Fetch available tools from the backend API and categorize them"""
-    try:
-        backend_url = get_backend_api_url()
-        response = requests.get(f"{backend_url}/tools", timeout=5)
-        if response.status_code == 200:
-            all_tools = response.json().get('tools', [])
-            
-            # Separate agent tools from other backend tools
-            agent_tools = []
-            backend_tools = []
-            
-            for tool in all_tools:
-                if tool['name'].startswith('agent_'):
-                    agent_tools.append(tool)
-                else:
-                    backend_tools.append(tool)
-            
-            return backend_tools, agent_tools
+    """Fetch available tools from the backend API and categorize them; returns (backend, agents, error)"""
+    data, error = get_json("/tools")
+    if error:
+        return [], [], f"Could not fetch tools from backend: {error}"
+    
+    # Separate agent tools from other backend tools
+    agent_tools = []
+    backend_tools = []
+    
+    for tool in (data or {}).get('tools', []):
+        # Parameter markdown is built once per fetch, not on every rerun
+        if tool.get('inputSchema', {}).get('properties'):
+            tool['_params_md'] = format_parameters(tool['inputSchema'])
+        
+        if tool['name'].startswith('agent_'):
+            # Clean up the agent name for display
+            tool['_display_name'] = tool['name'].removeprefix('agent_').replace('_', ' ').title()
+            agent_tools.append(tool)
         else:
-            return [], []
-    except Exception as e:
-        st.error(f"Could not fetch tools from backend: {str(e)}")
-        return [], []
+            backend_tools.append(tool)
+    
+    return backend_tools, agent_tools, None
+
+def get_recorder_tools_dir():
+    """Get the agent-resources/tools directory next to streamlit_pages"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    return os.path.join(parent_dir, "agent-resources", "tools")
 
 def fetch_recorder_tools():
     """Fetch tools saved by the recorder from agent-resources/tools directory"""
-    recorder_tools = []
+    tools_dir = get_recorder_tools_dir()
+    try:
+        dir_mtime_ns = os.stat(tools_dir).st_mtime_ns
+    except OSError:
+        return []
     
-    # Get the current directory (streamlit_pages) and navigate to agent-resources/tools
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(current_dir)
-    tools_dir = os.path.join(parent_dir, "agent-resources", "tools")
+    # An unchanged directory mtime means no tool was added or removed
+    now = time.monotonic()
+    with _RECORDER_SCAN_LOCK:
+        if _RECORDER_SCAN['mtime'] == dir_mtime_ns and now - _RECORDER_SCAN['at'] < RECORDER_RESCAN_INTERVAL:
+            return list(_RECORDER_SCAN['tools'])
     
-    if not os.path.exists(tools_dir):
-        return recorder_tools
+    recorder_tools = load_recorder_tools(tools_dir)
+    with _RECORDER_SCAN_LOCK:
+        _RECORDER_SCAN.update(mtime=dir_mtime_ns, at=now, tools=recorder_tools)
+    return list(recorder_tools)
+
+def clear_recorder_tools():
+    """Force the next fetch_recorder_tools call to rescan the directory"""
+    with _RECORDER_SCAN_LOCK:
+        _RECORDER_SCAN['mtime'] = None
+
+def find_tool_metadata(tree):
+    """Return the value node of a top-level TOOL_METADATA assignment, if any"""
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == 'TOOL_METADATA' for target in node.targets
+        ):
+            return node.value
+    return None
+
+@lru_cache(maxsize=256)
+def parse_tool_file(tool_file, mtime_ns):
+    """Describe one tool file; keyed on its mtime so only edited files are re-read"""
+    try:
+        with open(tool_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None  # Skip files that can't be read
     
-    # Find all Python files in the tools directory
-    tool_files = glob.glob(os.path.join(tools_dir, "*.py"))
+    filename = os.path.basename(tool_file)
+    tool_name = filename[:-3]
     
-    for tool_file in tool_files:
-        try:
-            with open(tool_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract tool metadata if it exists
-            metadata_match = re.search(r'TOOL_METADATA\s*=\s*\{([^}]+)\}', content, re.DOTALL)
+    # One parse serves both the metadata and the docstring, whatever their quoting or nesting
+    try:
+        tree = ast.parse(content, filename=tool_file)
+    except SyntaxError:
+        tree = None
+    metadata_node = find_tool_metadata(tree) if tree else None
+    
+    if metadata_node is None:
+        # This is a regular tool file without recorder metadata
+        # Extract description from docstring if available
+        docstring = ast.get_docstring(tree) if tree else None
+        return {
+            'name': tool_name,
+            'description': docstring or f"Tool from {tool_name}.py",
+            'source': 'agent-resources',
+            'session_id': None,
+            'file_path': tool_file,
+            'filename': filename
+        }
+    
+    # This is a recorder-generated tool with metadata
+    try:
+        metadata = ast.literal_eval(metadata_node)
+    except (ValueError, TypeError):
+        metadata = None
+    
+    if not isinstance(metadata, dict):
+        # If parsing metadata fails, add as basic tool
+        return {
+            'name': tool_name,
+            'description': f"Browser automation tool ({tool_name})",
+            'source': 'recorder',
+            'session_id': 'unknown',
+            'file_path': tool_file,
+            'filename': filename
+        }
+    
+    return {
+        'name': metadata.get('name') or tool_name,
+        'description': metadata.get('description') or "Browser automation tool generated from recording",
+        'source': 'recorder',
+        'session_id': metadata.get('recording_session_id') or "unknown",
+        'file_path': tool_file,
+        'filename': filename
+    }
+
+def load_recorder_tools(tools_dir):
+    """Parse the tool files in tools_dir"""
+    # Pass 1: list the Python files with their mtimes; scandir entries carry their stat
+    with os.scandir(tools_dir) as entries:
+        tool_files = [
+            (entry.path, entry.stat().st_mtime_ns)
+            for entry in entries
+            if entry.name.endswith('.py') and entry.is_file()
+        ]
+    
+    # Pass 2: describe each file, skipping any that couldn't be read
+    tools = [parse_tool_file(path, mtime_ns) for path, mtime_ns in tool_files]
+    return [tool for tool in tools if tool]
+
+@lru_cache(maxsize=32)
+def read_tool_file(tool_file, mtime_ns):
+    """Read a tool file for download; keyed on its mtime so repeat downloads skip the disk"""
+    with open(tool_file, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def format_parameters(input_schema):
+    """Format a tool's input schema as one markdown parameter list"""
+    required = set(input_schema.get('required', []))
+    lines = ["**Parameters:**"]
+    for param_name, param_info in input_schema['properties'].items():
+        param_type = param_info.get('type', 'unknown')
+        param_desc = param_info.get('description', 'No description')
+        required_badge = "🔴 Required" if param_name in required else "🟡 Optional"
+        lines.append(f"- `{param_name}` ({param_type}) - {param_desc} {required_badge}")
+    return "\n".join(lines)
+
+def render_tool(tool, icon, badge, title=None, expanded=False):
+    """Render one tool as an expander with its description, details and parameters"""
+    with st.expander(f"{icon} {title or tool['name']}", expanded=expanded):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write("**Description:**")
+            st.write(tool.get('description', 'No description available'))
+        with col2:
+            st.markdown(badge)
+        
+        # Show the actual tool name when the title is a cleaned-up display name
+        if title:
+            st.write(f"**Tool Name:** `{tool['name']}`")
+        
+        # Show additional info for recorder tools
+        if tool.get('session_id'):
+            st.write(f"**Recording Session:** `{tool['session_id']}`")
+        
+        if tool.get('file_path'):
+            st.write(f"**File:** `{tool['filename']}`")
             
-            if metadata_match:
-                # This is a recorder-generated tool with metadata
+            # The file is only read once the user asks for it
+            prepare_key = f"prepare_download_{tool['filename']}"
+            if st.session_state.get(prepare_key):
                 try:
-                    # Extract metadata values
-                    name_match = re.search(r'"name":\s*"([^"]+)"', metadata_match.group(0))
-                    desc_match = re.search(r'"description":\s*"([^"]+)"', metadata_match.group(0))
-                    session_match = re.search(r'"recording_session_id":\s*"([^"]+)"', metadata_match.group(0))
-                    
-                    tool_name = name_match.group(1) if name_match else os.path.basename(tool_file)[:-3]
-                    tool_desc = desc_match.group(1) if desc_match else "Browser automation tool generated from recording"
-                    session_id = session_match.group(1) if session_match else "unknown"
-                    
-                    recorder_tools.append({
-                        'name': tool_name,
-                        'description': tool_desc,
-                        'source': 'recorder',
-                        'session_id': session_id,
-                        'file_path': tool_file,
-                        'filename': os.path.basename(tool_file)
-                    })
+                    file_content = read_tool_file(tool['file_path'], os.stat(tool['file_path']).st_mtime_ns)
+                    st.download_button(
+                        label="📥 Download Tool",
+                        data=file_content,
+                        file_name=tool['filename'],
+                        mime="text/x-python",
+                        key=f"download_{tool['filename']}"
+                    )
                 except Exception as e:
-                    # If parsing metadata fails, add as basic tool
-                    tool_name = os.path.basename(tool_file)[:-3]
-                    recorder_tools.append({
-                        'name': tool_name,
-                        'description': f"Browser automation tool ({tool_name})",
-                        'source': 'recorder',
-                        'session_id': 'unknown',
-                        'file_path': tool_file,
-                        'filename': os.path.basename(tool_file)
-                    })
-            else:
-                # This is a regular tool file without recorder metadata
-                # Extract description from docstring if available
-                docstring_match = re.search(r'"""([^"]+)"""', content)
-                tool_name = os.path.basename(tool_file)[:-3]
-                tool_desc = docstring_match.group(1).strip() if docstring_match else f"Tool from {tool_name}.py"
-                
-                recorder_tools.append({
-                    'name': tool_name,
-                    'description': tool_desc,
-                    'source': 'agent-resources',
-                    'session_id': None,
-                    'file_path': tool_file,
-                    'filename': os.path.basename(tool_file)
-                })
-                
-        except Exception as e:
-            continue  # Skip files that can't be read
+                    st.error(f"Could not load file: {str(e)}")
+            elif st.button("📥 Download Tool", key=f"prepare_{tool['filename']}"):
+                st.session_state[prepare_key] = True
+                st.rerun()
+        
+        if tool.get('_params_md'):
+            st.markdown(tool['_params_md'])
+
+def post_server_action(server_id, action):
+    """POST a start/stop action to the backend; returns an error message or None"""
+    try:
+        response = get_session().post(f"{get_backend_api_url()}/servers/{server_id}/{action}", timeout=10)
+        if response.status_code == 200:
+            return None
+        return f"Failed to {action} server"
+    except Exception as e:
+        return f"Error: {e}"
+
+def request_server_action(server_id, action):
+    """Button callback: send a start/stop action in the background"""
+    st.session_state[f"server_action_{server_id}"] = (action, _ACTION_EXECUTOR.submit(with_script_run_ctx(post_server_action), server_id, action))
+
+def collect_server_actions():
+    """Pop finished start/stop actions; returns (action, error) pairs and whether any are pending"""
+    finished = []
+    pending = False
+    for key in [k for k in st.session_state.keys() if k.startswith("server_action_")]:
+        action, future = st.session_state[key]
+        if future.done():
+            del st.session_state[key]
+            finished.append((action, future.result()))
+        else:
+            pending = True
     
-    return recorder_tools
+    # Server status changed, so the cached server list is stale
+    if finished:
+        fetch_installed_servers.clear()
+    return finished, pending
+
+@st.fragment(run_every=1)
+def server_action_poll():
+    """Rerun the page once every pending start/stop action has finished"""
+    if all(st.session_state[k][1].done() for k in st.session_state.keys() if k.startswith("server_action_")):
+        st.rerun()
 
 def mcp_tab():
     """Display the Tools page with MCP server info and available tools"""
@@ -174,138 +358,105 @@ def mcp_tab():
     # Available Tools Section
     st.subheader("🛠️ Available Tools")
     
+    if st.button("🔄 Refresh Tools", key="refresh_tools"):
+        fetch_available_tools.clear()
+        fetch_installed_servers.clear()
+        clear_recorder_tools()
+    
+    # Start/stop actions that finished since the last run; done before fetching so the list is fresh
+    finished_actions, actions_pending = collect_server_actions()
+    
     with st.spinner("Loading available tools..."):
-        backend_tools, agent_tools = fetch_available_tools()
+        # Both backend requests run at once while the local tools are scanned
+        tools_future = _EXECUTOR.submit(with_script_run_ctx(fetch_available_tools))
+        servers_future = _EXECUTOR.submit(with_script_run_ctx(fetch_installed_servers))
         recorder_tools = fetch_recorder_tools()
-        installed_servers = fetch_installed_servers()
+        backend_tools, agent_tools, tools_error = tools_future.result()
+        installed_servers, servers_error = servers_future.result()
+    
+    # Errors are reported here since cached fetchers can't render
+    if tools_error:
+        st.error(tools_error)
+    if servers_error:
+        st.error(servers_error)
     
     total_tools = len(backend_tools) + len(agent_tools) + len(recorder_tools)
     
     if total_tools > 0 or installed_servers:
         st.success(f"Found {total_tools} available tools ({len(backend_tools)} backend, {len(agent_tools)} agents, {len(recorder_tools)} local) + {len(installed_servers)} installed servers")
         
-        # Create tabs for different tool sources
+        # Create tabs, recording each tab's index as it is added
         tabs_to_create = ["🔀 All Tools"]
+        tab_map = {'all': 0}
         if installed_servers:
+            tab_map['servers'] = len(tabs_to_create)
             tabs_to_create.append("📦 Installed Servers")
-        if backend_tools:
-            tabs_to_create.append("🖥️ Backend Tools")
-        if agent_tools:
-            tabs_to_create.append("🤖 Agents")
-        if recorder_tools:
-            tabs_to_create.append("🎬 Local Tools")
         
         tabs = st.tabs(tabs_to_create)
         
         # Map tabs to variables for easier access
-        tab_all = tabs[0]
-        
-        # Find the installed servers tab index
-        servers_tab_index = None
-        if "📦 Installed Servers" in tabs_to_create:
-            servers_tab_index = tabs_to_create.index("📦 Installed Servers")
-        tab_servers = tabs[servers_tab_index] if servers_tab_index is not None else None
+        tab_all = tabs[tab_map['all']]
+        tab_servers = tabs[tab_map['servers']] if 'servers' in tab_map else None
         
-        # Find the backend tab index
-        backend_tab_index = None
-        if "🖥️ Backend Tools" in tabs_to_create:
-            backend_tab_index = tabs_to_create.index("🖥️ Backend Tools")
-        tab_backend = tabs[backend_tab_index] if backend_tab_index is not None else None
-        
-        # Find the agent tab index
-        agent_tab_index = None
-        if "🤖 Agents" in tabs_to_create:
-            agent_tab_index = tabs_to_create.index("🤖 Agents")
-        tab_agents = tabs[agent_tab_index] if agent_tab_index is not None else None
-        
-        # Find the local tab index  
-        local_tab_index = None
-        if "🎬 Local Tools" in tabs_to_create:
-            local_tab_index = tabs_to_create.index("🎬 Local Tools")
-        tab_local = tabs[local_tab_index] if local_tab_index is not None else None
-        
-        # All Tools tab
+        # All Tools tab; every tool is rendered once, narrowed by source if requested
         with tab_all:
-            # Display Backend Tools
-            if backend_tools:
-                for tool in backend_tools:
-                    with st.expander(f"🖥️ {tool['name']}", expanded=False):
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.write("**Description:**")
-                            st.write(tool.get('description', 'No description available'))
-                        with col2:
-                            st.markdown("🖥️ **Backend**")
-                        
-                        if 'inputSchema' in tool and tool['inputSchema'].get('properties'):
-                            st.write("**Parameters:**")
-                            for param_name, param_info in tool['inputSchema']['properties'].items():
-                                param_type = param_info.get('type', 'unknown')
-                                param_desc = param_info.get('description', 'No description')
-                                required = param_name in tool['inputSchema'].get('required', [])
-                                required_badge = "🔴 Required" if required else "🟡 Optional"
-                                st.write(f"- `{param_name}` ({param_type}) - {param_desc} {required_badge}")
+            source = st.radio("Show", ["All", "🖥️ Backend", "🤖 Agents", "🎬 Local"], horizontal=True, key="tool_source_filter")
             
-            # Display Agent Tools
-            if agent_tools:
-                for tool in agent_tools:
-                    with st.expander(f"🤖 {tool['name'].replace('agent_', '').title()}", expanded=False):
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.write("**Description:**")
-                            st.write(tool.get('description', 'No description available'))
-                        with col2:
-                            st.markdown("🤖 **Agent**")
-                        
-                        if 'inputSchema' in tool and tool['inputSchema'].get('properties'):
-                            st.write("**Parameters:**")
-                            for param_name, param_info in tool['inputSchema']['properties'].items():
-                                param_type = param_info.get('type', 'unknown')
-                                param_desc = param_info.get('description', 'No description')
-                                required = param_name in tool['inputSchema'].get('required', [])
-                                required_badge = "🔴 Required" if required else "🟡 Optional"
-                                st.write(f"- `{param_name}` ({param_type}) - {param_desc} {required_badge}")
+            # One flat list of (source, icon, badge, title, tool) across backend, agent and local tools
+            all_tools = [("🖥️ Backend", "🖥️", "🖥️ **Backend**", None, tool) for tool in backend_tools]
+            all_tools += [("🤖 Agents", "🤖", "🤖 **Agent**", tool['_display_name'], tool) for tool in agent_tools]
+            all_tools += [
+                ("🎬 Local", "🎬", "🎬 **Recorder**" if tool['source'] == 'recorder' else "📁 **Local**", None, tool)
+                for tool in recorder_tools
+            ]
             
-            # Display Recorder Tools
-            if recorder_tools:
-                for tool in recorder_tools:
-                    
-                    with st.expander(f"🎬 {tool['name']}", expanded=False):
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.write("**Description:**")
-                            st.write(tool['description'])
-                        with col2:
-                            if tool['source'] == 'recorder':
-                                st.markdown("🎬 **Recorder**")
-                            else:
-                                st.markdown("📁 **Local**")
-                        
-                        # Show additional info for recorder tools
-                        if tool.get('session_id'):
-                            st.write(f"**Recording Session:** `{tool['session_id']}`")
-                        
-                        st.write(f"**File:** `{tool['filename']}`")
-                        
-                        # Add download button for the tool file
-                        try:
-                            with open(tool['file_path'], 'r', encoding='utf-8') as f:
-                                file_content = f.read()
-                            st.download_button(
-                                label="📥 Download Tool",
-                                data=file_content,
-                                file_name=tool['filename'],
-                                mime="text/x-python",
-                                key=f"download_{tool['filename']}"
-                            )
-                        except Exception as e:
-                            st.error(f"Could not load file: {str(e)}")
+            # Tools in the selected source, keyed by their display label; tools sharing a name
+            # (e.g. two agents both exposing `search`) get a "#n" suffix so none is dropped
+            shown_tools = {}
+            for tool_source, icon, badge, title, tool in all_tools:
+                if source in ("All", tool_source):
+                    label = base_label = f"{icon} {title or tool['name']}"
+                    n = 1
+                    while label in shown_tools:
+                        n += 1
+                        label = f"{base_label} #{n}"
+                    shown_tools[label] = (tool_source, icon, badge, title, tool)
+            
+            # One table for the whole list; details render only for the tool being inspected
+            st.dataframe(
+                [
+                    {"Tool": label, "Description": entry[4].get('description', ''), "Source": entry[0]}
+                    for label, entry in shown_tools.items()
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            selected = st.selectbox(
+                "Inspect tool",
+                list(shown_tools),
+                index=None,
+                placeholder="Choose a tool to see its details and parameters"
+            )
+            if selected is not None:
+                tool_source, icon, badge, title, tool = shown_tools[selected]
+                render_tool(tool, icon, badge, title=title, expanded=True)
         
         # Installed Servers tab
         if tab_servers and installed_servers:
             with tab_servers:
                 st.markdown("### 📦 Installed Marketplace Servers")
                 
+                for action, error in finished_actions:
+                    if error:
+                        st.error(error)
+                    else:
+                        st.success(f"Server {'started' if action == 'start' else 'stopped'}!")
+                
+                # Poll only while an action is in flight
+                if actions_pending:
+                    server_action_poll()
+                
                 for server in installed_servers:
                     server_name = server.get('name', 'Unknown Server')
                     server_status = server.get('status', 'unknown')
@@ -327,29 +478,16 @@ def mcp_tab():
                         
                         with col2:
                             # Server control buttons
-                            if server_status == "stopped":
-                                if st.button(f"▶️ Start", key=f"start_{server['id']}", use_container_width=True):
-                                    try:
-                                        response = requests.post(f"{get_backend_api_url()}/servers/{server['id']}/start", timeout=10)
-                                        if response.status_code == 200:
-                                            st.success("Server started!")
-                                            st.rerun()
-                                        else:
-                                            st.error("Failed to start server")
-                                    except Exception as e:
-                                        st.error(f"Error: {e}")
+                            if f"server_action_{server['id']}" in st.session_state:
+                                st.markdown("🟡 **Pending…**")
+                            
+                            elif server_status == "stopped":
+                                st.button(f"▶️ Start", key=server['_start_key'], use_container_width=True,
+                                          on_click=request_server_action, args=(server['id'], "start"))
                             
                             elif server_status == "running":
-                                if st.button(f"⏹️ Stop", key=f"stop_{server['id']}", use_container_width=True):
-                                    try:
-                                        response = requests.post(f"{get_backend_api_url()}/servers/{server['id']}/stop", timeout=10)
-                                        if response.status_code == 200:
-                                            st.success("Server stopped!")
-                                            st.rerun()
-                                        else:
-                                            st.error("Failed to stop server")
-                                    except Exception as e:
-                                        st.error(f"Error: {e}")
+                                st.button(f"⏹️ Stop", key=server['_stop_key'], use_container_width=True,
+                                          on_click=request_server_action, args=(server['id'], "stop"))
                         
                         # Show available tools from this server
                         if server_tools:
@@ -363,78 +501,6 @@ def mcp_tab():
                         if server.get('command'):
                             st.write(f"**Command:** `{server['command']} {' '.join(server.get('args', []))}`")
         
-        # Backend Tools tab
-        if tab_backend and backend_tools:
-            with tab_backend:
-                for tool in backend_tools:
-                    with st.expander(f"🖥️ {tool['name']}", expanded=False):
-                        st.write("**Description:**")
-                        st.write(tool.get('description', 'No description available'))
-                        
-                        if 'inputSchema' in tool and tool['inputSchema'].get('properties'):
-                            st.write("**Parameters:**")
-                            for param_name, param_info in tool['inputSchema']['properties'].items():
-                                param_type = param_info.get('type', 'unknown')
-                                param_desc = param_info.get('description', 'No description')
-                                required = param_name in tool['inputSchema'].get('required', [])
-                                required_badge = "🔴 Required" if required else "🟡 Optional"
-                                st.write(f"- `{param_name}` ({param_type}) - {param_desc} {required_badge}")
-        
-        # Agents tab
-        if tab_agents and agent_tools:
-            with tab_agents:
-                for tool in agent_tools:
-                    # Clean up the agent name for display
-                    agent_name = tool['name'].replace('agent_', '').replace('_', ' ').title()
-                    with st.expander(f"🤖 {agent_name}", expanded=False):
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.write("**Description:**")
-                            st.write(tool.get('description', 'No description available'))
-                        with col2:
-                            st.markdown("🤖 **Agent**")
-                        
-                        # Show the actual tool name for technical reference
-                        st.write(f"**Tool Name:** `{tool['name']}`")
-                        
-                        if 'inputSchema' in tool and tool['inputSchema'].get('properties'):
-                            st.write("**Parameters:**")
-                            for param_name, param_info in tool['inputSchema']['properties'].items():
-                                param_type = param_info.get('type', 'unknown')
-                                param_desc = param_info.get('description', 'No description')
-                                required = param_name in tool['inputSchema'].get('required', [])
-                                required_badge = "🔴 Required" if required else "🟡 Optional"
-                                st.write(f"- `{param_name}` ({param_type}) - {param_desc} {required_badge}")
-        
-        # Local Tools tab
-        if tab_local and recorder_tools:
-            with tab_local:
-                for tool in recorder_tools:
-                    
-                    with st.expander(f"🎬 {tool['name']}", expanded=False):
-                        st.write("**Description:**")
-                        st.write(tool['description'])
-                        
-                        # Show additional info
-                        if tool.get('session_id'):
-                            st.write(f"**Recording Session:** `{tool['session_id']}`")
-                        
-                        st.write(f"**Source:** {'🎬 Recorder' if tool['source'] == 'recorder' else '📁 Local'}")
-                        st.write(f"**File:** `{tool['filename']}`")
-                        
-                        # Add download button for the tool file
-                        try:
-                            with open(tool['file_path'], 'r', encoding='utf-8') as f:
-                                file_content = f.read()
-                            st.download_button(
-                                label="📥 Download Tool",
-                                data=file_content,
-                                file_name=tool['filename'],
-                                mime="text/x-python",
-                                key=f"download_local_{tool['filename']}"
-                            )
-                        except Exception as e:
-                            st.error(f"Could not load file: {str(e)}")
     else:
         st.warning("No tools available. Make sure the backend server is running or use the Recorder to create browser automation tools.")
     
@@ -484,13 +550,10 @@ def mcp_tab():
             st.info("💡 Use this URL directly in your MCP client configuration instead of the complex setup below.")
             
             # Generate IDE-specific configuration
-            ide_config = generate_mcp_config_for_ide(selected_ide, mcp_url)
+            ide_config, config_language = render_ide_config(selected_ide, mcp_url)
             
             st.markdown("### IDE-Specific Configuration")
-            if isinstance(ide_config, dict):
-                st.code(json.dumps(ide_config, indent=2), language="json")
-            else:
-                st.code(ide_config, language="text")
+            st.code(ide_config, language=config_language)
                 
             st.markdown("### Quick Setup")
             if selected_ide == "Claude Code":
@@ -1,118 +1,379 @@
 import streamlit as st
 import requests
-import json
 import time
 import zipfile
 import io
+import mmap
+import operator
+import orjson
 import os
 import re
+import secrets
+import string
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from pathlib import Path
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
+from urllib3.util.retry import Retry
+
+from streamlit_pages.script_context import with_script_run_ctx
 
 # Backend API configuration
 BACKEND_API_URL = "http://localhost:8100"
 
+# Endpoint URLs, built once; the templated ones take str.format arguments
+_URL_BOOTSTRAP = f"{BACKEND_API_URL}/bootstrap"
+_URL_SESSIONS = f"{BACKEND_API_URL}/recorder/sessions"
+_URL_SESSION = f"{BACKEND_API_URL}/recorder/sessions/{{session_id}}"
+_URL_GENERATE_TOOL = f"{BACKEND_API_URL}/recorder/sessions/{{session_id}}/generate-tool"
+_URL_RECORDER_START = f"{BACKEND_API_URL}/recorder/start"
+_URL_RECORDER_STOP = f"{BACKEND_API_URL}/recorder/stop"
+_URL_RECORDER_ACTIONS_BATCH = f"{BACKEND_API_URL}/recorder/actions/batch"
+_URL_TOOL_EXEC = f"{BACKEND_API_URL}/tools/{{name}}/execute"
+_URL_AGENTS_REGISTER = f"{BACKEND_API_URL}/agents/register"
+
+# Request bodies are serialized with orjson and sent as raw bytes
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_EMPTY_ARGUMENTS_BODY = orjson.dumps({"arguments": {}})
+
+# Background GETs that overlap with the page's own backend calls
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Recorded actions fetched and shown per page in session details
+ACTIONS_PAGE_SIZE = 50
+
+# Source templates for generated tools, parsed once; fields are filled with Template.substitute
+_AGENT_TEMPLATE = string.Template('''"""
+${tool_description}
+
+Generated from browser recording session: ${session_id}
+This agent executes the recorded browser automation workflow.
+"""
+
+import asyncio
+from pydantic_ai import Agent
+from pydantic_ai.models.openai import OpenAIModel
+
+# Initialize the agent
+browser_automation_agent = Agent(
+    model=OpenAIModel("gpt-4o-mini"),
+    system_prompt="""You are a browser automation agent that executes recorded workflows.
+    Your primary function is to execute the browser automation sequence that was recorded."""
+)
+
+@browser_automation_agent.tool
+async def execute_recorded_workflow() -> str:
+    """Execute the recorded browser automation workflow"""
+    try:
+        import requests
+        
+        # The recorded workflow execution
+        # This is the actual recorded code:
+        ${tool_code}
+        
+        # Execute the original recorded function
+        result = _original_execute_recorded_action()
+        return f"Browser automation completed successfully: {result}"
+        
+    except Exception as e:
+        return f"Browser automation failed: {str(e)}"
+
+# Main execution function for MCP integration
+async def run_agent(params: dict = None):
+    """Main function to run the browser automation agent"""
+    try:
+        result = await browser_automation_agent.run("Execute the recorded browser workflow")
+        return {
+            "success": True,
+            "result": result.data,
+            "type": "browser_automation",
+            "session_id": "${session_id}"
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "type": "browser_automation",
+            "session_id": "${session_id}"
+        }
+
+# For backward compatibility
+def execute_recorded_action():
+    """Legacy function name"""
+    return asyncio.run(run_agent())
+''')
+
+_SAVED_TOOL_TEMPLATE = string.Template('''"""
+${tool_description}
+
+Generated from browser recording session: ${session_id}
+Tool Name: ${tool_name}
+"""
+
+${tool_code}
+
+# Tool metadata for agent integration
+TOOL_METADATA = {
+    "name": "${tool_name}",
+    "description": "${tool_description}",
+    "generated_from_recording": True,
+    "recording_session_id": "${session_id}",
+    "file_name": "${file_name}",
+    "registered_as_agent": True
+}
+''')
+
+_DOWNLOAD_TOOL_TEMPLATE = string.Template('''"""
+${tool_description}
+
+Generated from browser recording session: ${session_id}
+Tool Name: ${tool_name}
+"""
+
+${tool_code}
+
+# Tool metadata for agent integration
+TOOL_METADATA = {
+    "name": "${tool_name}",
+    "description": "${tool_description}",
+    "generated_from_recording": True,
+    "recording_session_id": "${session_id}",
+}
+''')
+
+# Reads a session's status and action count in one call
+_STATUS_AND_ACTIONS = operator.itemgetter('status', 'actionsCount')
+
+# What the extension captures, shown when a recording starts
+RECORDING_CAPTURE_MD = """
+- 🧭 **Navigation** (page changes, URL updates)
+- 🖱️ **Clicks** (buttons, links, form elements) 
+- ⌨️ **Typing** (form inputs, text fields)
+- 📋 **Form interactions** (dropdowns, checkboxes)
+- ⏸️ **Page waits** (loading, delays)
+"""
+
+# Shown in the Recording Tips expander
+RECORDING_TIPS_MD = """
+**For best results:**
+
+✅ **Good practices:**
+- Use clear, descriptive element identifiers (IDs, unique text)
+- Wait for pages to fully load before interacting
+- Keep actions simple and focused on one workflow
+- Test the recorded actions on the same website
+
+⚠️ **Limitations:**
+- Works best with consistent website layouts
+- May need manual adjustments for dynamic content
+- Generated tools work with the specific website structure
+- Some complex interactions may not record perfectly
+"""
+
+# Shown under a generated tool
+TOOL_USAGE_MD = """
+**To use this generated tool:**
+
+1. **Save the code**: Download or copy the generated Python code
+2. **Add to agent resources**: Place the file in your `agent-resources/tools/` directory
+3. **Update agent**: Your AI agents can now use this tool automatically
+4. **Test the tool**: Run the function to make sure it works as expected
+
+**Example usage in agent:**
+```python
+# The agent can now call this tool automatically
+result = execute_your_recorded_action()
+print(result)
+```
+"""
+
+@st.cache_resource
+def get_session():
+    """Pooled backend session shared by every call on this page, surviving reruns and reloads"""
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        # Only idempotent requests are retried, so recorder POSTs are never replayed
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Saved tools live in the shared agent resources directory
+TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'agent-resources', 'tools'))
+_CREATED_DIRS = set()
+
+# Generated tool code keyed by session, its action count and end time, and the backend generator version,
+# reused across reruns and restarts; only the newest TOOL_CACHE_MAX_FILES entries are kept
+TOOL_CACHE_DIR = os.path.expanduser("~/.mymcp/tool_cache")
+TOOL_CACHE_MAX_FILES = 64
+
+# Extension files packed into the fallback zip, relative to the extension directory
+ESSENTIAL_FILES = (
+    'manifest.json',
+    'popup.html',
+    'connect.html',
+    'lib/popup.js',
+    'lib/background.js',
+    'lib/connect.js',
+    'lib/content.js',
+    'lib/relayConnection.js',
+)
+ICON_EXT = ('.png',)
+
+# Extension zip bytes keyed by the source files and their mtimes, so reruns skip the disk
+_ZIP_CACHE: Dict[tuple, bytes] = {}
+
 def create_extension_zip():
     """Create a zip file of the browser extension with latest built files"""
     extension_path = "/home/ubuntu/mymcpme2/mymcp-me/extension"
     
     # Check if we have a pre-built latest zip
     latest_zip_path = os.path.join(extension_path, "mymcp-extension-latest.zip")
-    if os.path.exists(latest_zip_path):
-        with open(latest_zip_path, 'rb') as f:
-            return f.read()
+    try:
+        cache_key = ((latest_zip_path, os.stat(latest_zip_path).st_mtime_ns),)
+        if cache_key not in _ZIP_CACHE:
+            data = Path(latest_zip_path).read_bytes()
+            _ZIP_CACHE.clear()
+            _ZIP_CACHE[cache_key] = data
+        return _ZIP_CACHE[cache_key]
+    except FileNotFoundError:
+        pass
     
     # Fallback: create zip dynamically
+    # Collect (archive name, path, mtime) for every file that exists; the stat doubles as the existence check
+    sources = []
+    for file_name in ESSENTIAL_FILES:
+        file_path = os.path.join(extension_path, file_name)
+        try:
+            sources.append((file_name, file_path, os.stat(file_path).st_mtime_ns))
+        except FileNotFoundError:
+            continue
+    
+    # Add icon files, if the icons directory exists
+    icons_dir = os.path.join(extension_path, 'icons')
+    try:
+        with os.scandir(icons_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(ICON_EXT):
+                    sources.append((f'icons/{entry.name}', entry.path, entry.stat().st_mtime_ns))
+    except FileNotFoundError:
+        pass
+    
+    # Reuse the last build unless a source file was added, removed or modified
+    cache_key = tuple((file_name, mtime_ns) for file_name, _, mtime_ns in sources)
+    if cache_key in _ZIP_CACHE:
+        return _ZIP_CACHE[cache_key]
+    
     zip_buffer = io.BytesIO()
     
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Include essential files only
-        essential_files = [
-            'manifest.json',
-            'popup.html', 
-            'connect.html',
-            'lib/popup.js',
-            'lib/background.js', 
-            'lib/connect.js',
-            'lib/content.js',
-            'lib/relayConnection.js'
-        ]
-        
-        # Add essential files
-        for file_name in essential_files:
-            file_path = os.path.join(extension_path, file_name)
-            if os.path.exists(file_path):
-                zip_file.write(file_path, file_name)
-        
-        # Add icon files
-        icons_dir = os.path.join(extension_path, 'icons')
-        if os.path.exists(icons_dir):
-            for icon_file in os.listdir(icons_dir):
-                if icon_file.endswith('.png'):
-                    icon_path = os.path.join(icons_dir, icon_file)
-                    zip_file.write(icon_path, f'icons/{icon_file}')
+    # Fastest deflate level: the files are small text and PNGs, so higher levels barely shrink them
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+        for file_name, file_path, _ in sources:
+            # Map each file and let the compressor read it in place rather than copying it into bytes
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    zip_file.writestr(file_name, b'')
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    zip_file.writestr(file_name, mapped)
     
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue()
+    _ZIP_CACHE.clear()
+    _ZIP_CACHE[cache_key] = zip_buffer.getvalue()
+    return _ZIP_CACHE[cache_key]
 
-def check_extension_connection():
-    """Check if the browser extension is connected and ready"""
+def error_text(response) -> str:
+    """The backend's error message from a failed response, or the start of its raw body"""
     try:
-        # Check HTTP API connection status
-        response = requests.get(f"{BACKEND_API_URL}/extension/status", timeout=2)
+        return orjson.loads(response.content).get('error', 'Unknown error')
+    except (ValueError, AttributeError):
+        return f"HTTP {response.status_code} - {response.text[:200]}"
+
+def _safe_get(url: str, timeout: float) -> Optional[Dict[str, Any]]:
+    """GET a backend JSON payload; None when the backend is down, errors or returns bad JSON"""
+    try:
+        response = get_session().get(url, timeout=timeout)
         if response.status_code == 200:
-            status_data = response.json()
-            api_connected = status_data.get("connected", False)
-            websocket_ready = status_data.get("websocketReady", False)
-        else:
-            api_connected = False
-            websocket_ready = False
-        
-        # For DOM events extension (v2.0.0), HTTP connection is sufficient for recording
-        # WebSocket is only needed for browser automation tool execution
-        return {
-            "api_connected": api_connected,
-            "websocket_ready": websocket_ready,
-            "fully_connected": api_connected,  # Recording only needs HTTP
-            "recording_ready": api_connected,   # New field for recording capability
-            "tool_execution_ready": api_connected and websocket_ready  # Tool execution needs both
-        }
-    except:
-        return {
-            "api_connected": False,
-            "websocket_ready": False,
-            "fully_connected": False,
-            "recording_ready": False,
-            "tool_execution_ready": False
-        }
+            return orjson.loads(response.content)
+        return None
+    except (requests.RequestException, ValueError):
+        return None
+
+@st.cache_data(ttl=2, show_spinner=False)
+def fetch_bootstrap():
+    """Health, extension status and recorder sessions in one backend call; None when the backend is down"""
+    return _safe_get(_URL_BOOTSTRAP, timeout=3)
 
-def auto_detect_recent_session():
+def check_extension_connection(bootstrap: Optional[Dict[str, Any]]):
+    """Check if the browser extension is connected and ready, from the bootstrap status"""
+    status_data = (bootstrap or {}).get("extensionStatus") or {}
+    api_connected = status_data.get("connected", False)
+    websocket_ready = status_data.get("websocketReady", False)
+    
+    # For DOM events extension (v2.0.0), HTTP connection is sufficient for recording
+    # WebSocket is only needed for browser automation tool execution
+    return {
+        "api_connected": api_connected,
+        "websocket_ready": websocket_ready,
+        "fully_connected": api_connected,  # Recording only needs HTTP
+        "recording_ready": api_connected,   # New field for recording capability
+        "tool_execution_ready": api_connected and websocket_ready  # Tool execution needs both
+    }
+
+def _is_completed_with_actions(status, actions_count):
+    return status == 'stopped' and actions_count > 0
+
+def forget_detected_session():
+    """Drop the auto-detected session and remember its id so it isn't detected again"""
+    session = st.session_state.pop("last_completed_session", None)
+    if session:
+        st.session_state["forgotten_session_id"] = session.get('id')
+
+def auto_detect_recent_session(sessions_data: Optional[Dict[str, Any]]):
     """Auto-detect most recent completed session for tool generation"""
-    try:
-        sessions_response = requests.get(f"{BACKEND_API_URL}/recorder/sessions", timeout=3)
-        if sessions_response.status_code == 200:
-            sessions_data = sessions_response.json()
-            if sessions_data.get('success') and sessions_data.get('sessions'):
-                # Find completed sessions with actions
-                completed_sessions = [
-                    s for s in sessions_data['sessions'] 
-                    if s['status'] == 'stopped' and s['actionsCount'] > 0
-                ]
-                
-                if completed_sessions and "last_completed_session" not in st.session_state:
+    session = st.session_state.get("last_completed_session")
+    
+    # Probe only until a session has been detected, skipping one the user forgot
+    if session is None:
+        try:
+            if sessions_data and sessions_data.get('success') and sessions_data.get('sessions'):
+                forgotten_id = st.session_state.get("forgotten_session_id")
+                # Stop at the first completed session with actions (newest first)
+                session = next(
+                    (s for s in sessions_data['sessions']
+                     if s.get('id') != forgotten_id and _is_completed_with_actions(*_STATUS_AND_ACTIONS(s))),
+                    None
+                )
+                if session:
                     # Auto-select the most recent completed session
-                    most_recent = completed_sessions[0]  # Assuming newest first
-                    st.session_state["last_completed_session"] = most_recent
-                    
-                    # Show an info message that we found a recent session
-                    st.info(f"🎯 Found recent recording: **{most_recent['name']}** ({most_recent['actionsCount']} actions)")
-    except Exception:
-        pass  # Silently handle errors
+                    st.session_state["last_completed_session"] = session
+        except Exception:
+            pass  # Silently handle errors
+    
+    if session:
+        # Show an info message while a session is selected
+        st.info(f"🎯 Found recent recording: **{session['name']}** ({session['actionsCount']} actions)")
+        st.button("✖️ Forget detected session", key="forget_detected_session", on_click=forget_detected_session)
 
 def recorder_tab():
     """Browser Action Recorder interface"""
     
+    # The open session's details are fetched alongside the bootstrap call, so the two GETs overlap
+    viewed_id = st.session_state.get("viewed_session_id")
+    details_future = _EXECUTOR.submit(with_script_run_ctx(fetch_session), viewed_id, actions_page_offset(viewed_id)) if viewed_id else None
+    
+    # Health, extension status and sessions come from one cached bootstrap call
+    bootstrap = fetch_bootstrap()
+    if details_future is not None:
+        # Only warms the cache; show_session_details reports any error itself
+        wait([details_future])
+    
     # Check for recent completed sessions and auto-show tool generation
-    auto_detect_recent_session()
+    auto_detect_recent_session(bootstrap and bootstrap.get("sessions"))
     
     st.markdown("# 🎬 Browser Action Recorder")
     st.markdown("""
@@ -145,11 +406,7 @@ def recorder_tab():
         """)
     
     # Check if backend API is available
-    try:
-        response = requests.get(f"{BACKEND_API_URL}/health", timeout=5)
-        api_available = response.status_code == 200
-    except:
-        api_available = False
+    api_available = bootstrap is not None
     
     if not api_available:
         st.error("🚨 Backend API is not available. Please start the backend server first.")
@@ -160,81 +417,22 @@ def recorder_tab():
     recorder_tab, sessions_tab, tools_tab = st.tabs(["🎬 Record Actions", "📚 Sessions", "🛠️ Generated Tools"])
     
     with recorder_tab:
-        show_recorder_interface()
+        show_recorder_interface(bootstrap)
     
     with sessions_tab:
         show_sessions_interface()
     
     with tools_tab:
         show_tools_interface()
-
-def show_recorder_interface():
-    """Main recording interface with browser extension integration"""
-    
-    # Step 1: Extension Installation Check
-    st.markdown("### 🎬 Browser Recording Setup")
-    
-    # Check if user has extension installed
-    with st.expander("📥 Step 1: Install Browser Extension", expanded=True):
-        st.markdown("""
-        **MyMCP.me requires a browser extension for recording your actions:**
-        
-        **Option A: Download Latest Extension Zip (Recommended)**
-        1. **Download the zip file** using the button below (includes Generate Tool button!)
-        2. **Extract the zip** to any folder on your computer  
-        3. **Install in Chrome/Edge**: 
-           - Open `chrome://extensions/` or `edge://extensions/`
-           - Enable "Developer mode" 
-           - Click "Load unpacked"
-           - Select the extracted extension folder
-        4. **Look for the extension icon** in your browser toolbar
-        
-        **Option B: Use Local Installation**
-        - Extension Location: `/home/ubuntu/mymcpme2/mymcp-me/extension/`
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            try:
-                zip_data = create_extension_zip()
-                st.download_button(
-                    label="📦 Download Latest Extension.zip",
-                    data=zip_data,
-                    file_name="mymcp-browser-extension-latest.zip",
-                    mime="application/zip",
-                    type="primary",
-                    help="Downloads the latest extension with Generate Tool button"
-                )
-                st.success("✅ **Latest Version**: Includes Generate Tool button in popup")
-                st.info("🔧 **New Features**: Auto-connect, DOM events recording, session recovery, tool generation & frontend redirect")
-            except Exception as e:
-                st.error(f"Failed to create extension zip: {str(e)}")
-                st.code("Fallback Path: /home/ubuntu/mymcpme2/mymcp-me/extension/")
-        
-        with col2:
-            if st.button("📋 Copy Local Path"):
-                st.info("Copy this path: `/home/ubuntu/mymcpme2/mymcp-me/extension/`")
-                
-        # Extension version diagnostic
-        st.markdown("---")
-        st.markdown("**🔍 Extension Version Check:**")
-        st.markdown("""
-        **How to verify you have the latest extension:**
-        1. Right-click the extension icon → "Manage extension"
-        2. Check version shows **"2.1.0"** (latest with session recovery)
-        3. The popup should show **"Generate Tool"** button (not just download)
-        4. If you see **"Session not found"** errors, re-download and reinstall the extension
-        """)
-        
-        if st.button("🔄 **I'm getting 'Session not found' errors - Help!**", type="secondary"):
-            st.error("**Issue**: You likely have an older extension version that doesn't include session recovery logic.")
-            st.success("**Solution**: Download the latest extension using the button above and reinstall it.")
-            st.info("**Steps**: 1) Download new zip 2) Extract it 3) Go to chrome://extensions/ 4) Remove old extension 5) Load the new unpacked extension")
     
-    # Step 2: Extension Connection  
-    # Check current connection status
-    connection_status = check_extension_connection()
+    # One rerun for every mutation made during this pass
+    if st.session_state.pop("_dirty", False):
+        st.rerun()
+
+@st.fragment
+def connection_status_fragment():
+    """Step 2 connection panel; its refresh button reruns only this panel"""
+    connection_status = check_extension_connection(fetch_bootstrap())
     is_fully_connected = connection_status["fully_connected"]
     
     with st.expander("🔗 Step 2: Connect Extension", expanded=not connection_status.get("recording_ready", False)):
@@ -304,7 +502,180 @@ def show_recorder_interface():
         
         # Refresh button
         if st.button("🔄 Refresh Connection Status", key="refresh_connection"):
-            st.rerun()
+            fetch_bootstrap.clear()
+            st.rerun(scope="fragment")
+
+@st.fragment
+def recording_status_fragment():
+    """Current recording status and manual fallback actions, rerun on their own"""
+    st.markdown("### 📊 Recording Status")
+    
+    # Retry manual actions a failed submit left queued
+    flush_pending_actions()
+    
+    # Show current recording status
+    if "recording_session_id" in st.session_state:
+        st.success(f"🔴 Recording: {st.session_state.get('recording_session_name', 'Unknown')}")
+        st.info(f"Session ID: `{st.session_state['recording_session_id']}`")
+        
+        # Real-time recording status
+        st.markdown("#### 🎬 Recording in Progress")
+        st.info("Perform actions in your connected browser tab. Actions will be automatically captured via the browser extension.")
+        
+        # Show captured actions count if available
+        if st.button("🔄 Refresh Status"):
+            get_recording_status()
+    else:
+        st.info("No active recording session")
+        st.info("💡 To generate tools from completed recordings, use the **Generated Tools** tab above")
+        
+        # Fallback for manual testing (temporary)
+        with st.expander("🔧 Manual Testing (Fallback)", expanded=False):
+            st.warning("For testing purposes only - use extension for real recordings")
+            
+            action_type = st.selectbox(
+                "Action Type",
+                ["navigate", "click", "type", "wait", "screenshot"],
+                key="action_type_select"
+            )
+            
+            # Inputs only submit with the form, so typing doesn't rerun the panel on every keystroke
+            with st.form("manual_action_form", clear_on_submit=False):
+                if action_type == "navigate":
+                    url = st.text_input("URL to navigate to", placeholder="https://example.com")
+                elif action_type == "click":
+                    element = st.text_input("Element to click", placeholder="Search button")
+                elif action_type == "type":
+                    col_element, col_text = st.columns(2)
+                    with col_element:
+                        element = st.text_input("Input field", placeholder="Email field")
+                    with col_text:
+                        text = st.text_input("Text to type", placeholder="user@example.com")
+                elif action_type == "wait":
+                    duration = st.number_input("Wait duration (seconds)", min_value=1, max_value=10, value=2)
+                
+                submitted = st.form_submit_button(f"➕ Add {action_type.title()} Action")
+            
+            if submitted:
+                if action_type == "navigate" and url:
+                    add_manual_action("navigate", {"url": url, "description": f"Navigate to {url}"})
+                elif action_type == "click" and element:
+                    add_manual_action("click", {"selector": element, "description": f"Click on {element}"})
+                elif action_type == "type" and element and text:
+                    add_manual_action("type", {"selector": element, "text": text, "description": f"Type '{text}' into {element}"})
+                elif action_type == "wait":
+                    add_manual_action("wait", {"description": f"Wait {duration} seconds"})
+                elif action_type == "screenshot":
+                    add_manual_action("screenshot", {"description": "Take screenshot"})
+            
+            # Auto-refresh status
+            if st.button("🔄 Refresh Status"):
+                st.rerun(scope="fragment")
+
+@st.fragment
+def tool_test_fragment():
+    """Browser tool test buttons, rerun on their own"""
+    st.markdown("**Test that your extension can execute browser automation tools:**")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        screenshot_clicked = st.button("📸 Test Screenshot Tool", type="secondary")
+    with col2:
+        snapshot_clicked = st.button("📄 Test Page Snapshot", type="secondary")
+    with col3:
+        all_clicked = st.button("🧪 Test Both", type="secondary")
+    
+    # Selected tests run concurrently, so testing both takes as long as the slowest one
+    names = [name for name, clicked in (
+        ("browser_screenshot", screenshot_clicked or all_clicked),
+        ("browser_snapshot", snapshot_clicked or all_clicked),
+    ) if clicked]
+    for name, (result, error) in zip(names, run_tool_tests(names)):
+        if error:
+            st.error(f"❌ {error}")
+        elif name == "browser_screenshot":
+            st.success("✅ Screenshot tool executed successfully!")
+            if result.get("result"):
+                st.info(f"Result: {result['result']}")
+        else:
+            st.success("✅ Snapshot tool executed successfully!")
+            if result.get("result"):
+                st.info(f"Result: {result['result'][:200]}...")
+
+def show_recorder_interface(bootstrap: Dict[str, Any]):
+    """Main recording interface with browser extension integration"""
+    
+    # Step 1: Extension Installation Check
+    st.markdown("### 🎬 Browser Recording Setup")
+    
+    # Check if user has extension installed
+    with st.expander("📥 Step 1: Install Browser Extension", expanded=True):
+        st.markdown("""
+        **MyMCP.me requires a browser extension for recording your actions:**
+        
+        **Option A: Download Latest Extension Zip (Recommended)**
+        1. **Download the zip file** using the button below (includes Generate Tool button!)
+        2. **Extract the zip** to any folder on your computer  
+        3. **Install in Chrome/Edge**: 
+           - Open `chrome://extensions/` or `edge://extensions/`
+           - Enable "Developer mode" 
+           - Click "Load unpacked"
+           - Select the extracted extension folder
+        4. **Look for the extension icon** in your browser toolbar
+        
+        **Option B: Use Local Installation**
+        - Extension Location: `/home/ubuntu/mymcpme2/mymcp-me/extension/`
+        """)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            try:
+                # The zip is only built and attached to the page once the user asks for it
+                if st.session_state.get("prepare_extension_zip"):
+                    st.download_button(
+                        label="📦 Download Latest Extension.zip",
+                        data=create_extension_zip(),
+                        file_name="mymcp-browser-extension-latest.zip",
+                        mime="application/zip",
+                        type="primary",
+                        help="Downloads the latest extension with Generate Tool button"
+                    )
+                elif st.button("📦 Download Latest Extension.zip", type="primary", key="prepare_extension_zip_button"):
+                    st.session_state.prepare_extension_zip = True
+                    st.rerun()
+                st.success("✅ **Latest Version**: Includes Generate Tool button in popup")
+                st.info("🔧 **New Features**: Auto-connect, DOM events recording, session recovery, tool generation & frontend redirect")
+            except Exception as e:
+                st.error(f"Failed to create extension zip: {str(e)}")
+                st.code("Fallback Path: /home/ubuntu/mymcpme2/mymcp-me/extension/")
+        
+        with col2:
+            if st.button("📋 Copy Local Path"):
+                st.info("Copy this path: `/home/ubuntu/mymcpme2/mymcp-me/extension/`")
+                
+        # Extension version diagnostic
+        st.markdown("---")
+        st.markdown("**🔍 Extension Version Check:**")
+        st.markdown("""
+        **How to verify you have the latest extension:**
+        1. Right-click the extension icon → "Manage extension"
+        2. Check version shows **"2.1.0"** (latest with session recovery)
+        3. The popup should show **"Generate Tool"** button (not just download)
+        4. If you see **"Session not found"** errors, re-download and reinstall the extension
+        """)
+        
+        if st.button("🔄 **I'm getting 'Session not found' errors - Help!**", type="secondary"):
+            st.error("**Issue**: You likely have an older extension version that doesn't include session recovery logic.")
+            st.success("**Solution**: Download the latest extension using the button above and reinstall it.")
+            st.info("**Steps**: 1) Download new zip 2) Extract it 3) Go to chrome://extensions/ 4) Remove old extension 5) Load the new unpacked extension")
+    
+    # Step 2: Extension Connection  
+    # Check current connection status
+    connection_status = check_extension_connection(bootstrap)
+    is_fully_connected = connection_status["fully_connected"]
+    
+    connection_status_fragment()
     
     st.divider()
     
@@ -356,127 +727,16 @@ def show_recorder_interface():
                 stop_recording()
     
     with col2:
-        st.markdown("### 📊 Recording Status")
-        
-        # Show current recording status
-        if "recording_session_id" in st.session_state:
-            st.success(f"🔴 Recording: {st.session_state.get('recording_session_name', 'Unknown')}")
-            st.info(f"Session ID: `{st.session_state['recording_session_id']}`")
-            
-            # Real-time recording status
-            st.markdown("#### 🎬 Recording in Progress")
-            st.info("Perform actions in your connected browser tab. Actions will be automatically captured via the browser extension.")
-            
-            # Show captured actions count if available
-            if st.button("🔄 Refresh Status"):
-                get_recording_status()
-        else:
-            st.info("No active recording session")
-            st.info("💡 To generate tools from completed recordings, use the **Generated Tools** tab above")
-            
-            # Fallback for manual testing (temporary)
-            with st.expander("🔧 Manual Testing (Fallback)", expanded=False):
-                st.warning("For testing purposes only - use extension for real recordings")
-                
-                action_type = st.selectbox(
-                    "Action Type",
-                    ["navigate", "click", "type", "wait", "screenshot"],
-                    key="action_type_select"
-                )
-                
-                if action_type == "navigate":
-                    url = st.text_input("URL to navigate to", placeholder="https://example.com")
-                    if st.button("➕ Add Navigate Action") and url:
-                        add_manual_action("navigate", {"url": url, "description": f"Navigate to {url}"})
-                
-                elif action_type == "click":
-                    element = st.text_input("Element to click", placeholder="Search button")
-                    if st.button("➕ Add Click Action") and element:
-                        add_manual_action("click", {"selector": element, "description": f"Click on {element}"})
-                
-                elif action_type == "type":
-                    col_element, col_text = st.columns(2)
-                    with col_element:
-                        element = st.text_input("Input field", placeholder="Email field")
-                    with col_text:
-                        text = st.text_input("Text to type", placeholder="user@example.com")
-                    if st.button("➕ Add Type Action") and element and text:
-                        add_manual_action("type", {"selector": element, "text": text, "description": f"Type '{text}' into {element}"})
-                
-                elif action_type == "wait":
-                    duration = st.number_input("Wait duration (seconds)", min_value=1, max_value=10, value=2)
-                    if st.button("➕ Add Wait Action"):
-                        add_manual_action("wait", {"description": f"Wait {duration} seconds"})
-                
-                elif action_type == "screenshot":
-                    if st.button("➕ Add Screenshot Action"):
-                        add_manual_action("screenshot", {"description": "Take screenshot"})
-                
-                # Auto-refresh status
-                if st.button("🔄 Refresh Status"):
-                    st.rerun()
+        recording_status_fragment()
     
     # Test tool execution section
     if is_fully_connected:
         with st.expander("⚡ Test Browser Automation", expanded=False):
-            st.markdown("**Test that your extension can execute browser automation tools:**")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("📸 Test Screenshot Tool", type="secondary"):
-                    try:
-                        response = requests.post(
-                            f"{BACKEND_API_URL}/tools/browser_screenshot/execute",
-                            json={"arguments": {}},
-                            timeout=10
-                        )
-                        
-                        if response.status_code == 200:
-                            result = response.json()
-                            st.success("✅ Screenshot tool executed successfully!")
-                            if result.get("result"):
-                                st.info(f"Result: {result['result']}")
-                        else:
-                            st.error(f"❌ Tool execution failed: {response.text}")
-                    except Exception as e:
-                        st.error(f"❌ Error testing tool: {str(e)}")
-            
-            with col2:
-                if st.button("📄 Test Page Snapshot", type="secondary"):
-                    try:
-                        response = requests.post(
-                            f"{BACKEND_API_URL}/tools/browser_snapshot/execute",
-                            json={"arguments": {}},
-                            timeout=10
-                        )
-                        
-                        if response.status_code == 200:
-                            result = response.json()
-                            st.success("✅ Snapshot tool executed successfully!")
-                            if result.get("result"):
-                                st.info(f"Result: {result['result'][:200]}...")
-                        else:
-                            st.error(f"❌ Tool execution failed: {response.text}")
-                    except Exception as e:
-                        st.error(f"❌ Error testing tool: {str(e)}")
+            tool_test_fragment()
     
     # Recording tips
     with st.expander("💡 Recording Tips", expanded=False):
-        st.markdown("""
-        **For best results:**
-        
-        ✅ **Good practices:**
-        - Use clear, descriptive element identifiers (IDs, unique text)
-        - Wait for pages to fully load before interacting
-        - Keep actions simple and focused on one workflow
-        - Test the recorded actions on the same website
-        
-        ⚠️ **Limitations:**
-        - Works best with consistent website layouts
-        - May need manual adjustments for dynamic content
-        - Generated tools work with the specific website structure
-        - Some complex interactions may not record perfectly
-        """)
+        st.markdown(RECORDING_TIPS_MD)
 
 def show_sessions_interface():
     """Show all recording sessions"""
@@ -488,37 +748,47 @@ def show_sessions_interface():
         st.rerun()
     
     try:
-        response = requests.get(f"{BACKEND_API_URL}/recorder/sessions", timeout=10)
+        response = get_session().get(_URL_SESSIONS, timeout=10)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             sessions = data.get("sessions", [])
             
             if not sessions:
                 st.info("No recording sessions found. Start by recording some browser actions!")
                 return
             
+            # Pull every field out once as parallel columns, then render row by row
+            names, descriptions, counts, statuses, durations, ids = zip(*(
+                (s['name'], s.get('description'), s['actionsCount'], s['status'], s.get('duration', 0), s['id'])
+                for s in sessions
+            ))
+            
             # Display sessions in cards
-            for session in sessions:
+            for name, description, count, status, duration, session_id in zip(names, descriptions, counts, statuses, durations, ids):
                 with st.container():
                     col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
                     
                     with col1:
-                        st.markdown(f"**{session['name']}**")
-                        if session.get('description'):
-                            st.caption(session['description'])
-                        st.caption(f"Actions: {session['actionsCount']} | Status: {session['status']}")
+                        st.markdown(f"**{name}**")
+                        if description:
+                            st.caption(description)
+                        st.caption(f"Actions: {count} | Status: {status}")
                     
                     with col2:
-                        duration = session.get('duration', 0)
                         st.metric("Duration", f"{duration // 1000}s")
                     
                     with col3:
-                        if st.button("👁️ View", key=f"view_{session['id']}"):
-                            show_session_details(session['id'])
+                        # Kept in session state so paging through the actions doesn't close the details
+                        if st.button("👁️ View", key=f"view_{session_id}"):
+                            viewing = st.session_state.get("viewed_session_id") == session_id
+                            st.session_state["viewed_session_id"] = None if viewing else session_id
                     
                     with col4:
-                        if st.button("🗑️ Delete", key=f"delete_{session['id']}"):
-                            delete_session(session['id'])
+                        if st.button("🗑️ Delete", key=f"delete_{session_id}"):
+                            delete_session(session_id)
+                    
+                    if st.session_state.get("viewed_session_id") == session_id:
+                        show_session_details(session_id)
                     
                     st.divider()
         
@@ -538,11 +808,7 @@ def show_tools_interface():
         st.markdown("### 🔧 Generate New Tool")
         
         # Check if we already have a tool being generated/customized
-        active_generation = None
-        for key in st.session_state.keys():
-            if key.startswith("tool_generation_"):
-                active_generation = key.replace("tool_generation_", "")
-                break
+        active_generation = st.session_state.get("active_tool_generation_id")
         
         if active_generation:
             # Show the active tool generation
@@ -551,17 +817,21 @@ def show_tools_interface():
             # Add a button to start over
             if st.button("🔄 Generate Different Tool", type="secondary"):
                 # Clear the current generation
-                for key in list(st.session_state.keys()):
-                    if active_generation in key:
-                        del st.session_state[key]
+                for key in (
+                    "active_tool_generation_id",
+                    f"tool_generation_{active_generation}",
+                    f"tools_tab_tool_name_{active_generation}",
+                    f"tools_tab_tool_desc_{active_generation}",
+                ):
+                    st.session_state.pop(key, None)
                 st.rerun()
         else:
             # Get sessions that can generate tools
             try:
-                response = requests.get(f"{BACKEND_API_URL}/recorder/sessions", timeout=10)
+                response = get_session().get(_URL_SESSIONS, timeout=10)
                 if response.status_code == 200:
-                    data = response.json()
-                    sessions = [s for s in data.get("sessions", []) if s['status'] in ['stopped', 'completed']]
+                    data = orjson.loads(response.content)
+                    sessions = tuple(s for s in data.get("sessions", []) if s['status'] in ('stopped', 'completed'))
                     
                     if not sessions:
                         st.info("No completed sessions available for tool generation.")
@@ -587,48 +857,92 @@ def show_tools_interface():
     with saved_tab:
         show_saved_tools()
 
+def execute_test_tool(name: str):
+    """Execute a browser tool with no arguments; returns (result, error message)"""
+    try:
+        response = get_session().post(
+            _URL_TOOL_EXEC.format(name=name),
+            data=_EMPTY_ARGUMENTS_BODY,
+            headers=_JSON_HEADERS,
+            timeout=10
+        )
+        
+        if response.status_code == 200:
+            return orjson.loads(response.content), None
+        return None, f"Tool execution failed: {response.text}"
+    except Exception as e:
+        return None, f"Error testing tool: {str(e)}"
+
+def run_tool_tests(names):
+    """Execute the named test tools concurrently; results are in the order of names"""
+    if not names:
+        return []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return list(executor.map(with_script_run_ctx(execute_test_tool), names))
+
+@st.cache_data(show_spinner=False)
+def read_tool_source(path: str, mtime_ns: int) -> str:
+    """Tool source, cached until the file's mtime changes"""
+    return Path(path).read_text(encoding='utf-8')
+
+@st.cache_data(show_spinner=False)
+def read_tool_metadata(path: str, mtime_ns: int) -> dict:
+    """Parsed tool metadata, cached until the file's mtime changes"""
+    return orjson.loads(Path(path).read_bytes())
+
+@st.cache_data(ttl=10, show_spinner=False)
+def load_saved_tools(tools_dir: str, fingerprint: tuple):
+    """Build the saved tool list; fingerprint is the directory and newest file mtime"""
+    entries = [e for e in os.scandir(tools_dir) if e.is_file()]
+    meta_by_stem = {e.name[:-len('_metadata.json')]: e for e in entries if e.name.endswith('_metadata.json')}
+    
+    tools = []
+    for entry in entries:
+        filename = entry.name
+        if not filename.endswith('.py') or filename.startswith('__'):
+            continue
+        
+        # Try to load metadata
+        metadata = {}
+        metadata_entry = meta_by_stem.get(filename[:-3])
+        if metadata_entry is not None:
+            try:
+                metadata = read_tool_metadata(metadata_entry.path, metadata_entry.stat().st_mtime_ns)
+            except:
+                pass
+        
+        # If no metadata, create basic info from filename
+        if not metadata:
+            metadata = {
+                "name": filename.replace('.py', '').replace('_', ' ').title(),
+                "description": "Browser automation tool",
+                "file_name": filename,
+                "generated_from_recording": False,
+                "type": "unknown"
+            }
+        
+        tools.append({
+            "path": entry.path,
+            "metadata": metadata
+        })
+    return tools
+
 def show_saved_tools():
     """Display saved tools from agent resources"""
     st.markdown("### 💼 Saved Tools")
     
     try:
         # Get the tools directory
-        tools_dir = os.path.join(os.path.dirname(__file__), '..', 'agent-resources', 'tools')
+        tools_dir = TOOLS_DIR
         
         if not os.path.exists(tools_dir):
             st.info("No tools directory found. Save a tool first to create it.")
             return
         
-        # Find all Python files and their metadata
-        tools = []
-        for filename in os.listdir(tools_dir):
-            if filename.endswith('.py') and not filename.startswith('__'):
-                tool_path = os.path.join(tools_dir, filename)
-                metadata_path = os.path.join(tools_dir, filename.replace('.py', '_metadata.json'))
-                
-                # Try to load metadata
-                metadata = {}
-                if os.path.exists(metadata_path):
-                    try:
-                        with open(metadata_path, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                    except:
-                        pass
-                
-                # If no metadata, create basic info from filename
-                if not metadata:
-                    metadata = {
-                        "name": filename.replace('.py', '').replace('_', ' ').title(),
-                        "description": "Browser automation tool",
-                        "file_name": filename,
-                        "generated_from_recording": False,
-                        "type": "unknown"
-                    }
-                
-                tools.append({
-                    "path": tool_path,
-                    "metadata": metadata
-                })
+        # One scandir pass; the tool list is rebuilt only when a file in the directory changes
+        entries = list(os.scandir(tools_dir))
+        fingerprint = (os.stat(tools_dir).st_mtime_ns, max((e.stat().st_mtime_ns for e in entries), default=0))
+        tools = load_saved_tools(tools_dir, fingerprint)
         
         if not tools:
             st.info("No tools found in agent resources. Generate and save a tool first!")
@@ -664,8 +978,7 @@ def show_saved_tools():
                 with col3:
                     # Download button
                     try:
-                        with open(tool["path"], 'r', encoding='utf-8') as f:
-                            code = f.read()
+                        code = read_tool_source(tool["path"], os.stat(tool["path"]).st_mtime_ns)
                         
                         st.download_button(
                             label="💾 Download",
@@ -681,8 +994,7 @@ def show_saved_tools():
                 view_key = f"view_tool_{metadata['file_name']}"
                 if st.session_state.get(view_key, False):
                     try:
-                        with open(tool["path"], 'r', encoding='utf-8') as f:
-                            code = f.read()
+                        code = read_tool_source(tool["path"], os.stat(tool["path"]).st_mtime_ns)
                         
                         with st.expander("📄 Tool Code", expanded=True):
                             st.code(code, language="python")
@@ -698,38 +1010,41 @@ def start_recording_with_extension(session_name: str, description: str = ""):
     """Start a new recording session with browser extension integration"""
     try:
         # First, start the recording session on the backend
-        response = requests.post(
-            f"{BACKEND_API_URL}/recorder/start",
-            json={"sessionName": session_name, "description": description},
+        response = get_session().post(
+            _URL_RECORDER_START,
+            data=orjson.dumps({"sessionName": session_name, "description": description}),
+            headers=_JSON_HEADERS,
             timeout=10
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             st.session_state["recording_session_id"] = data["sessionId"]
             st.session_state["recording_session_name"] = session_name
+            # A new session starts with an empty queue of manual actions
+            st.session_state.pop("_pending_actions", None)
             st.success(f"✅ {data['message']}")
             
             # Provide instructions for extension-based recording
             st.info("🎬 **Recording started!** Now perform actions in your connected browser tab. The extension will automatically capture:")
-            st.markdown("""
-            - 🧭 **Navigation** (page changes, URL updates)
-            - 🖱️ **Clicks** (buttons, links, form elements) 
-            - ⌨️ **Typing** (form inputs, text fields)
-            - 📋 **Form interactions** (dropdowns, checkboxes)
-            - ⏸️ **Page waits** (loading, delays)
-            """)
+            st.markdown(RECORDING_CAPTURE_MD)
             
             # Instructions for users
             st.warning("⚠️ **Important**: Make sure your browser extension is connected and active before performing actions!")
             
         else:
-            error_data = response.json() if response.headers.get('content-type') == 'application/json' else {"error": response.text}
-            st.error(f"❌ Failed to start recording: {error_data.get('error', 'Unknown error')}")
+            st.error(f"❌ Failed to start recording: {error_text(response)}")
     
     except Exception as e:
         st.error(f"❌ Error starting recording: {str(e)}")
 
+def action_rows(actions, start: int = 1):
+    """Table rows for recorded actions, numbered from start"""
+    return [
+        {"#": i, "Type": action.get('type'), "Description": action.get('description', 'No description')}
+        for i, action in enumerate(actions, start)
+    ]
+
 def get_recording_status():
     """Get the current status of the recording session"""
     if "recording_session_id" not in st.session_state:
@@ -737,10 +1052,10 @@ def get_recording_status():
     
     try:
         session_id = st.session_state["recording_session_id"]
-        response = requests.get(f"{BACKEND_API_URL}/recorder/sessions/{session_id}", timeout=5)
+        response = get_session().get(_URL_SESSION.format(session_id=session_id), timeout=5)
         
         if response.status_code == 200:
-            session_data = response.json()
+            session_data = orjson.loads(response.content)
             session = session_data.get("session", {})
             actions_count = len(session.get("actions", []))
             
@@ -749,9 +1064,8 @@ def get_recording_status():
                 
                 # Show recent actions
                 with st.expander("📋 Recent Actions", expanded=False):
-                    actions = session.get("actions", [])
-                    for i, action in enumerate(actions[-5:], 1):  # Show last 5 actions
-                        st.write(f"{i}. **{action['type']}**: {action.get('description', 'No description')}")
+                    # Last 5 actions as one table
+                    st.dataframe(action_rows(session.get("actions", [])[-5:]), use_container_width=True, hide_index=True)
             else:
                 st.info("No actions captured yet - make sure your extension is connected and active")
         else:
@@ -760,60 +1074,94 @@ def get_recording_status():
     except Exception as e:
         st.error(f"Error getting recording status: {str(e)}")
 
-def start_recording(session_name: str, description: str = ""):
-    """Legacy start recording function for backward compatibility"""
-    return start_recording_with_extension(session_name, description)
+# Legacy name kept for backward compatibility
+start_recording = start_recording_with_extension
 
 def stop_recording():
     """Stop the current recording session"""
+    # Queued manual actions belong to the session being stopped
+    flush_pending_actions()
     try:
-        response = requests.post(f"{BACKEND_API_URL}/recorder/stop", timeout=10)
+        response = get_session().post(_URL_RECORDER_STOP, timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             session = data["session"]
             
             # Store completed session info and clear recording state
             st.session_state["last_completed_session"] = session
-            if "recording_session_id" in st.session_state:
-                del st.session_state["recording_session_id"]
-            if "recording_session_name" in st.session_state:
-                del st.session_state["recording_session_name"]
+            st.session_state.pop("recording_session_id", None)
+            # Anything the flush above couldn't deliver can't go to another session
+            st.session_state.pop("_pending_actions", None)
+            st.session_state.pop("recording_session_name", None)
             
             st.success(f"✅ Recording stopped: {session['name']}")
             st.info(f"Recorded {session['actionsCount']} actions in {session['duration'] // 1000} seconds")
             
         else:
-            st.error(f"Failed to stop recording: {response.json().get('error', 'Unknown error')}")
+            st.error(f"Failed to stop recording: {error_text(response)}")
     
     except Exception as e:
         st.error(f"Error stopping recording: {str(e)}")
 
+@lru_cache(maxsize=256)
+def format_epoch_ms(ms: int) -> str:
+    """Local timestamp for a backend epoch-milliseconds value"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ms / 1000))
+
+@lru_cache(maxsize=256)
+def format_duration(start_ms: int, end_ms: int) -> str:
+    """Whole seconds between two epoch-milliseconds values"""
+    return f"{(end_ms - start_ms) // 1000}s"
+
+def get_session_page(session_id: str, offset: int = 0, limit: int = ACTIONS_PAGE_SIZE) -> Optional[Dict[str, Any]]:
+    """A recording session with one page of its actions and their total; None when the backend does not return it"""
+    response = get_session().get(
+        _URL_SESSION.format(session_id=session_id),
+        params={"offset": offset, "limit": limit},
+        timeout=10
+    )
+    if response.status_code != 200:
+        return None
+    return orjson.loads(response.content)["session"]
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_session(session_id: str, offset: int = 0, limit: int = ACTIONS_PAGE_SIZE) -> Optional[Dict[str, Any]]:
+    """get_session_page, shared across reruns for 30 seconds"""
+    return get_session_page(session_id, offset, limit)
+
+def actions_page_offset(session_id: str) -> int:
+    """Offset of the first action on the details page currently selected for a session"""
+    return (st.session_state.get(f"actions_page_{session_id}", 1) - 1) * ACTIONS_PAGE_SIZE
+
 def show_session_details(session_id: str):
     """Show detailed information about a session"""
     try:
-        response = requests.get(f"{BACKEND_API_URL}/recorder/sessions/{session_id}", timeout=10)
-        if response.status_code == 200:
-            session = response.json()["session"]
-            
+        page_key = f"actions_page_{session_id}"
+        offset = actions_page_offset(session_id)
+        session = fetch_session(session_id, offset)
+        if session is not None:
+            total = session.get('actionsTotal', len(session['actions']))
             st.markdown(f"### 📋 Session Details: {session['name']}")
             
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Actions", len(session['actions']))
+                st.metric("Actions", total)
                 st.metric("Status", session['status'])
             with col2:
-                start_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session['startTime'] / 1000))
-                st.metric("Started", start_time)
+                st.metric("Started", format_epoch_ms(session['startTime']))
                 if session.get('endTime'):
-                    duration = (session['endTime'] - session['startTime']) // 1000
-                    st.metric("Duration", f"{duration}s")
+                    st.metric("Duration", format_duration(session['startTime'], session['endTime']))
             
             # Show actions
             st.markdown("#### 🎯 Recorded Actions")
-            for i, action in enumerate(session['actions'], 1):
-                with st.expander(f"Action {i}: {action['description']}", expanded=False):
-                    st.json(action)
+            # Only one page of actions is fetched and rendered; the raw payloads sit behind a single collapsed element
+            pages = max(1, -(-total // ACTIONS_PAGE_SIZE))
+            if pages > 1:
+                st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key)
+            st.dataframe(action_rows(session['actions'], offset + 1), use_container_width=True, hide_index=True)
+            with st.expander("🧾 Raw Action Data", expanded=False):
+                st.json(session['actions'], expanded=False)
         
         else:
             st.error("Failed to fetch session details")
@@ -824,10 +1172,15 @@ def show_session_details(session_id: str):
 def delete_session(session_id: str):
     """Delete a recording session"""
     try:
-        response = requests.delete(f"{BACKEND_API_URL}/recorder/sessions/{session_id}", timeout=10)
+        response = get_session().delete(_URL_SESSION.format(session_id=session_id), timeout=10)
         if response.status_code == 200:
+            fetch_session.clear()
+            drop_cached_tool_code(session_id)
+            if st.session_state.get("viewed_session_id") == session_id:
+                st.session_state["viewed_session_id"] = None
             st.success("Session deleted successfully")
-            st.rerun()
+            # The list is refreshed by one rerun once the whole page has rendered
+            st.session_state["_dirty"] = True
         else:
             st.error("Failed to delete session")
     except Exception as e:
@@ -841,65 +1194,11 @@ def save_tool_to_resources(tool_name: str, tool_description: str, tool_code: str
             return False
         
         # Create agent code that wraps the browser automation
-        agent_code = f'''"""
-{tool_description}
-
-Generated from browser recording session: {session_id}
-This agent executes the recorded browser automation workflow.
-"""
-
-import asyncio
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-
-# Initialize the agent
-browser_automation_agent = Agent(
-    model=OpenAIModel("gpt-4o-mini"),
-    system_prompt="""You are a browser automation agent that executes recorded workflows.
-    Your primary function is to execute the browser automation sequence that was recorded."""
-)
-
-@browser_automation_agent.tool
-async def execute_recorded_workflow() -> str:
-    """Execute the recorded browser automation workflow"""
-    try:
-        import requests
-        
-        # The recorded workflow execution
-        # This is the actual recorded code:
-        {tool_code.replace('def ', 'def _original_')}
-        
-        # Execute the original recorded function
-        result = _original_execute_recorded_action()
-        return f"Browser automation completed successfully: {{result}}"
-        
-    except Exception as e:
-        return f"Browser automation failed: {{str(e)}}"
-
-# Main execution function for MCP integration
-async def run_agent(params: dict = None):
-    """Main function to run the browser automation agent"""
-    try:
-        result = await browser_automation_agent.run("Execute the recorded browser workflow")
-        return {{
-            "success": True,
-            "result": result.data,
-            "type": "browser_automation",
-            "session_id": "{session_id}"
-        }}
-    except Exception as e:
-        return {{
-            "success": False,
-            "error": str(e),
-            "type": "browser_automation",
-            "session_id": "{session_id}"
-        }}
-
-# For backward compatibility
-def execute_recorded_action():
-    """Legacy function name"""
-    return asyncio.run(run_agent())
-'''
+        agent_code = _AGENT_TEMPLATE.substitute(
+            tool_description=tool_description,
+            session_id=session_id,
+            tool_code=tool_code.replace('def ', 'def _original_')
+        )
         
         # Register as an agent in the MCP system
         register_payload = {
@@ -916,9 +1215,10 @@ def execute_recorded_action():
         }
         
         # Register with the backend
-        response = requests.post(
-            f"{BACKEND_API_URL}/agents/register", 
-            json=register_payload,
+        response = get_session().post(
+            _URL_AGENTS_REGISTER, 
+            data=orjson.dumps(register_payload),
+            headers=_JSON_HEADERS,
             timeout=30
         )
         
@@ -934,45 +1234,44 @@ def execute_recorded_action():
         # Fallback to local save
         return save_local_copy(tool_name, tool_description, tool_code, session_id)
 
+def ensure_dir(path: str):
+    """os.makedirs, skipped for directories this process has already created"""
+    if path not in _CREATED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _CREATED_DIRS.add(path)
+
+def write_file_atomic(path: str, data: bytes):
+    """Write data to a temporary sibling and rename it over path, so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
 def save_local_copy(tool_name: str, tool_description: str, tool_code: str, session_id: str) -> bool:
     """Save a local copy of the tool for backup and compatibility"""
     try:
-        import random
-        import string
-        
         # Generate random filename
-        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+        random_suffix = secrets.token_hex(4)
         clean_name = f"browser_tool_{random_suffix}.py"
         
         # Create enhanced tool code with proper metadata
-        enhanced_tool_code = f'''"""
-{tool_description}
-
-Generated from browser recording session: {session_id}
-Tool Name: {tool_name}
-"""
-
-{tool_code}
-
-# Tool metadata for agent integration
-TOOL_METADATA = {{
-    "name": "{tool_name}",
-    "description": "{tool_description}",
-    "generated_from_recording": True,
-    "recording_session_id": "{session_id}",
-    "file_name": "{clean_name}",
-    "registered_as_agent": True
-}}
-'''
+        enhanced_tool_code = _SAVED_TOOL_TEMPLATE.substitute(
+            tool_description=tool_description,
+            session_id=session_id,
+            tool_name=tool_name,
+            tool_code=tool_code,
+            file_name=clean_name
+        )
         
-        # Determine the tools directory path
-        tools_dir = os.path.join(os.path.dirname(__file__), '..', 'agent-resources', 'tools')
-        os.makedirs(tools_dir, exist_ok=True)
+        ensure_dir(TOOLS_DIR)
         
         # Write the tool file
-        tool_path = os.path.join(tools_dir, clean_name)
-        with open(tool_path, 'w', encoding='utf-8') as f:
-            f.write(enhanced_tool_code)
+        write_file_atomic(os.path.join(TOOLS_DIR, clean_name), enhanced_tool_code.encode('utf-8'))
         
         # Also create a JSON metadata file
         metadata = {
@@ -986,30 +1285,81 @@ TOOL_METADATA = {{
             "registered_as_agent": True
         }
         
-        metadata_path = os.path.join(tools_dir, f"{clean_name.replace('.py', '_metadata.json')}")
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+        metadata_path = os.path.join(TOOLS_DIR, f"browser_tool_{random_suffix}_metadata.json")
+        write_file_atomic(metadata_path, orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
         
         return True
         
     except Exception as e:
         return False
 
+def tool_cache_path(session_id: str) -> Optional[str]:
+    """On-disk cache path for code generated from the session as it stands; None if that can't be determined"""
+    try:
+        # An empty page still carries the action total and the generator version
+        session = get_session_page(session_id, 0, 0)
+    except (requests.RequestException, ValueError, KeyError):
+        return None
+    # Backends that don't report a generator version can't tell us when cached code goes stale
+    if not session or session.get('generatorVersion') is None:
+        return None
+    return os.path.join(
+        TOOL_CACHE_DIR,
+        f"{session_id}_{session['actionsTotal']}_{session.get('endTime') or 0}_v{session['generatorVersion']}.py"
+    )
+
+def drop_cached_tool_code(session_id: str):
+    """Remove every cached tool generated from a session"""
+    prefix = f"{session_id}_"
+    try:
+        with os.scandir(TOOL_CACHE_DIR) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix):
+                    os.remove(entry.path)
+    except FileNotFoundError:
+        pass
+
+def cap_tool_cache():
+    """Keep only the TOOL_CACHE_MAX_FILES most recently written cached tools"""
+    try:
+        with os.scandir(TOOL_CACHE_DIR) as entries:
+            files = sorted(((e.stat().st_mtime_ns, e.path) for e in entries if e.is_file()), reverse=True)
+        for _, path in files[TOOL_CACHE_MAX_FILES:]:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
 def generate_tool_code(session_id: str):
     """Generate tool code from a session"""
     try:
         # Store the request in session state to persist across reruns
         if f"tool_generation_{session_id}" not in st.session_state:
-            response = requests.post(f"{BACKEND_API_URL}/recorder/sessions/{session_id}/generate-tool", timeout=30)
+            # Code generated earlier from the exact same actions is reused from disk
+            cache_path = tool_cache_path(session_id)
+            try:
+                cached_code = Path(cache_path).read_text(encoding='utf-8') if cache_path else None
+            except FileNotFoundError:
+                cached_code = None
+            
+            if cached_code is None:
+                response = get_session().post(_URL_GENERATE_TOOL.format(session_id=session_id), timeout=30)
             
-            if response.status_code == 200:
-                data = response.json()
+            if cached_code is not None or response.status_code == 200:
+                if cached_code is None:
+                    cached_code = orjson.loads(response.content)["toolCode"]
+                    if cache_path:
+                        # Code for an older state of this session is never read again
+                        drop_cached_tool_code(session_id)
+                        ensure_dir(TOOL_CACHE_DIR)
+                        write_file_atomic(cache_path, cached_code.encode('utf-8'))
+                        cap_tool_cache()
                 st.session_state[f"tool_generation_{session_id}"] = {
-                    "tool_code": data["toolCode"],
+                    "tool_code": cached_code,
                     "generated": True,
                     "tool_name": f"browser_automation_{session_id[:6]}",
                     "tool_description": "Automated browser workflow generated from recorded session"
                 }
+                st.session_state["active_tool_generation_id"] = session_id
             else:
                 st.error(f"Failed to generate tool: {response.status_code}")
                 return
@@ -1058,23 +1408,12 @@ def generate_tool_code(session_id: str):
             
             with col1:
                 # Enhanced download button with content
-                enhanced_code = f'''"""
-{tool_description}
-
-Generated from browser recording session: {session_id}
-Tool Name: {tool_name}
-"""
-
-{tool_code}
-
-# Tool metadata for agent integration
-TOOL_METADATA = {{
-    "name": "{tool_name}",
-    "description": "{tool_description}",
-    "generated_from_recording": True,
-    "recording_session_id": "{session_id}",
-}}
-'''
+                enhanced_code = _DOWNLOAD_TOOL_TEMPLATE.substitute(
+                    tool_description=tool_description,
+                    session_id=session_id,
+                    tool_name=tool_name,
+                    tool_code=tool_code
+                )
                 st.download_button(
                     label="📥 Download Tool",
                     data=enhanced_code,
@@ -1089,8 +1428,6 @@ TOOL_METADATA = {{
             
             # Handle save button outside the column to avoid any layout issues
             if save_button:
-                st.balloons()  # Immediate visual feedback that button was clicked
-                st.write("🎉 BUTTON CLICKED - PROCESSING...")
                 if not tool_name.strip():
                     st.error("❌ Tool name is required!")
                 else:
@@ -1108,21 +1445,7 @@ TOOL_METADATA = {{
             
             # Usage instructions
             with st.expander("📖 How to use this tool", expanded=True):
-                st.markdown("""
-                **To use this generated tool:**
-                
-                1. **Save the code**: Download or copy the generated Python code
-                2. **Add to agent resources**: Place the file in your `agent-resources/tools/` directory
-                3. **Update agent**: Your AI agents can now use this tool automatically
-                4. **Test the tool**: Run the function to make sure it works as expected
-                
-                **Example usage in agent:**
-                ```python
-                # The agent can now call this tool automatically
-                result = execute_your_recorded_action()
-                print(result)
-                ```
-                """)
+                st.markdown(TOOL_USAGE_MD)
             
             # Clear session state and provide action buttons
             st.divider()
@@ -1131,27 +1454,18 @@ TOOL_METADATA = {{
             with col1:
                 if st.button("🔄 Start New Recording", type="primary", use_container_width=True):
                     # Clear any completed session data to return to main recording interface
-                    for key in ["last_completed_session", "selected_session_for_tool"]:
-                        if key in st.session_state:
-                            del st.session_state[key]
+                    forget_detected_session()
+                    st.session_state.pop("selected_session_for_tool", None)
                     st.rerun()
             
             with col2:
                 if st.button("📊 View All Sessions", use_container_width=True):
                     # This would typically navigate to a sessions page, but for now just clear current view
-                    if "last_completed_session" in st.session_state:
-                        del st.session_state["last_completed_session"]
+                    forget_detected_session()
                     st.rerun()
         
         else:
-            error_detail = "Unknown error"
-            try:
-                error_data = response.json()
-                error_detail = error_data.get('error', f'HTTP {response.status_code}')
-            except:
-                error_detail = f"HTTP {response.status_code} - {response.text[:200]}"
-            
-            st.error(f"Failed to generate tool: {error_detail}")
+            st.error(f"Failed to generate tool: {error_text(response)}")
             
             # Debug information
             with st.expander("🔧 Debug Information", expanded=False):
@@ -1169,28 +1483,46 @@ TOOL_METADATA = {{
         with st.expander("🔧 Debug Information", expanded=False):
             st.exception(e)
 
-def add_manual_action(action_type: str, action_data: Dict[str, Any]):
-    """Add a manual action to the current recording session"""
-    if "recording_session_id" not in st.session_state:
-        st.error("No active recording session")
+def flush_pending_actions():
+    """POST all queued manual actions as one batch; they stay queued only after a network error or 5xx"""
+    pending = st.session_state.get("_pending_actions")
+    if not pending:
+        return
+    
+    session_id = st.session_state.get("recording_session_id")
+    if session_id is None:
+        # The session they were recorded for has ended
+        st.session_state["_pending_actions"] = []
         return
     
     try:
-        # Use the existing /recorder/action endpoint
-        response = requests.post(
-            f"{BACKEND_API_URL}/recorder/action",
-            json={
-                "type": action_type,
-                **action_data
-            },
+        response = get_session().post(
+            _URL_RECORDER_ACTIONS_BATCH,
+            data=orjson.dumps({"sessionId": session_id, "actions": pending}),
+            headers=_JSON_HEADERS,
             timeout=10
         )
         
         if response.status_code == 200:
-            st.success(f"✅ Added {action_type} action: {action_data.get('description', 'Unknown action')}")
-            st.rerun()
+            st.session_state["_pending_actions"] = []
+            st.success(f"✅ Added {len(pending)} action(s): {', '.join(a.get('description', 'Unknown action') for a in pending)}")
         else:
-            st.error(f"Failed to add action: {response.json().get('error', 'Unknown error')}")
+            # A rejected batch would be rejected again, so only server errors are retried
+            if response.status_code < 500:
+                st.session_state["_pending_actions"] = []
+            st.error(f"Failed to add actions: {error_text(response)}")
     
+    except requests.RequestException as e:
+        st.error(f"Error adding actions: {str(e)}")
     except Exception as e:
-        st.error(f"Error adding action: {str(e)}")
\ No newline at end of file
+        st.session_state["_pending_actions"] = []
+        st.error(f"Error adding actions: {str(e)}")
+
+def add_manual_action(action_type: str, action_data: Dict[str, Any]):
+    """Send a manual action for the current recording session, together with any left over from a failed submit"""
+    if "recording_session_id" not in st.session_state:
+        st.error("No active recording session")
+        return
+    
+    st.session_state.setdefault("_pending_actions", []).append({"type": action_type, **action_data})
+    flush_pending_actions()
@@ -0,0 +1,31 @@
+"""
+Helpers for running page work on background threads.
+"""
+
+import functools
+import threading
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+
+def with_script_run_ctx(fn):
+    """
+    Wrap fn so it runs with the calling script's run context attached to the worker thread.
+    st.cache_data / st.cache_resource functions called inside fn then behave as on the script
+    thread instead of logging "missing ScriptRunContext". Call it on the script thread.
+    The worker's previous context is restored afterwards, so pooled threads don't keep a finished run's.
+    """
+    ctx = get_script_run_ctx()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        thread = threading.current_thread()
+        previous = get_script_run_ctx(suppress_warning=True)
+        add_script_run_ctx(thread, ctx)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            # add_script_run_ctx can't clear a context, so the attribute is reset directly
+            setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, previous)
+
+    return run
@@ -1,65 +1,132 @@
 import streamlit as st
 import requests
-import json
+import hashlib
+import orjson
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, List, Optional
 
+from streamlit_pages.script_context import with_script_run_ctx
+
+# Repeat tests of an unchanged credential within this window reuse the previous result
+TEST_DEBOUNCE_SECONDS = 2.0
+
+# The backend is on localhost, so a slow connect means it's down; fail fast instead of stalling the rerun
+CONNECT_TIMEOUT = 0.5
+
 def get_backend_api_url():
     """Get the backend API URL"""
     return "http://localhost:8100"
 
+@st.cache_resource
+def get_session():
+    """Shared keep-alive session to the backend, surviving reruns"""
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+    return session
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_setup_status(backend_url: str):
+    """Servers with their setup status plus every server's requirements, shared across reruns; request errors and non-200 replies propagate uncached"""
+    response = get_session().get(f"{backend_url}/setup", params={"include": "requirements"}, timeout=(CONNECT_TIMEOUT, 5))
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    return data.get('servers', []), data.get('requirements', {})
+
 def fetch_server_setup_status():
-    """Fetch all servers with their setup status"""
+    """Fetch all servers with their setup status; their requirements are kept for setup_server_interface"""
     try:
-        backend_url = get_backend_api_url()
-        response = requests.get(f"{backend_url}/setup", timeout=5)
-        if response.status_code == 200:
-            return response.json().get('servers', [])
-        else:
-            return []
+        servers, requirements = _cached_setup_status(get_backend_api_url())
+        st.session_state['_reqs_by_server'] = requirements
+        return servers
     except Exception as e:
         st.error(f"Could not fetch server setup status: {str(e)}")
         return []
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_server_requirements(backend_url: str, server_name: str):
+    """Setup requirements for one server, shared across reruns; request errors and non-200 replies propagate uncached"""
+    response = get_session().get(f"{backend_url}/setup/{server_name}", timeout=(CONNECT_TIMEOUT, 5))
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
 def get_server_requirements(server_name: str):
     """Get setup requirements for a specific server"""
     try:
-        backend_url = get_backend_api_url()
-        response = requests.get(f"{backend_url}/setup/{server_name}", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return None
+        return _cached_server_requirements(get_backend_api_url(), server_name)
     except Exception as e:
         st.error(f"Could not fetch requirements for {server_name}: {str(e)}")
         return None
 
+def prefetch_server_requirements(server_names: List[str]):
+    """Fetch requirements for servers the status payload didn't include, concurrently, into _reqs_by_server"""
+    reqs_by_server = st.session_state.setdefault('_reqs_by_server', {})
+    missing = [name for name in server_names if name not in reqs_by_server]
+    if not missing:
+        return
+    
+    def fetch(name):
+        try:
+            return _cached_server_requirements(backend_url, name)
+        except Exception:
+            return None  # setup_server_interface retries and reports the error
+    
+    backend_url = get_backend_api_url()
+    with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+        for name, requirements in zip(missing, executor.map(with_script_run_ctx(fetch), missing)):
+            if requirements:
+                reqs_by_server[name] = requirements
+
 def test_credentials(server_name: str, key: str, value: str):
     """Test API credentials"""
     try:
         backend_url = get_backend_api_url()
-        response = requests.post(
+        response = get_session().post(
             f"{backend_url}/setup/{server_name}/test",
             json={"key": key, "value": value},
-            timeout=10
+            timeout=(CONNECT_TIMEOUT, 10)
         )
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             return {"success": False, "error": f"HTTP {response.status_code}"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+def debounced_test_credentials(server_name: str, key: str, value: str):
+    """test_credentials, reusing the last result when the same value was tested under TEST_DEBOUNCE_SECONDS ago"""
+    last_tests = st.session_state.setdefault('_last_test', {})
+    value_hash = hashlib.sha1(value.encode()).digest()
+    now = time.monotonic()
+    
+    last = last_tests.get((server_name, key))
+    if last and last[0] == value_hash and now - last[1] < TEST_DEBOUNCE_SECONDS:
+        return last[2]
+    
+    result = test_credentials(server_name, key, value)
+    last_tests[(server_name, key)] = (value_hash, now, result)
+    return result
+
+def _trunc(text: str, limit: int = 50) -> str:
+    """Shorten text to limit characters plus an ellipsis"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
 def install_server(server_name: str):
     """Install a marketplace server"""
     try:
         backend_url = get_backend_api_url()
-        response = requests.post(
+        response = get_session().post(
             f"{backend_url}/servers/install",
             json={"serverName": server_name},
-            timeout=30
+            timeout=(CONNECT_TIMEOUT, 30)
         )
         if response.status_code == 200:
-            return response.json()
+            # A newly installed server changes what the setup page should show
+            _cached_setup_status.clear()
+            _cached_server_requirements.clear()
+            return orjson.loads(response.content)
         else:
             return {"success": False, "error": f"HTTP {response.status_code}"}
     except Exception as e:
@@ -82,9 +149,35 @@ def setup_tab():
         st.warning("No marketplace servers available. Contact administrator.")
         return
     
-    # Group servers by setup status
-    ready_servers = [s for s in servers if not s['needsSetup']]
-    needs_setup_servers = [s for s in servers if s['needsSetup']]
+    ss = st.session_state
+    setup_server = ss.get('setup_server')
+    show_iface = ss.get('show_setup_interface')
+    
+    # Group servers by setup status and fill the summary table columns in the same pass
+    ready_servers, needs_setup_servers = [], []
+    names, categories, statuses, descriptions = [], [], [], []
+    for server in servers:
+        if server['needsSetup']:
+            needs_setup_servers.append(server)
+            statuses.append(f"⚠️ Setup ({server['missingRequirements']} missing)")
+        else:
+            ready_servers.append(server)
+            statuses.append("✅ Ready")
+        names.append(server['displayName'])
+        categories.append(server['category'])
+        descriptions.append(_trunc(server['description']))
+    
+    # Columnar so st.dataframe builds its table without per-row schema inference
+    server_data = {
+        "Server": names,
+        "Category": categories,
+        "Status": statuses,
+        "Description": descriptions
+    }
+    
+    # Older backends don't bundle requirements with the status; fetch any gaps in parallel
+    with st.spinner("Loading server requirements..."):
+        prefetch_server_requirements([s['serverName'] for s in needs_setup_servers])
     
     # Create tabs for different server states
     if ready_servers and needs_setup_servers:
@@ -115,13 +208,13 @@ def setup_tab():
                     
                     with col2:
                         if st.button(f"⚙️ Setup", key=f"setup_{server['serverName']}", use_container_width=True):
-                            st.session_state[f'setup_server'] = server['serverName']
+                            setup_server = ss['setup_server'] = server['serverName']
                     
                     # Show setup interface if this server is selected
-                    if st.session_state.get('setup_server') == server['serverName']:
+                    if setup_server == server['serverName']:
                         st.markdown("---")
                         # Move setup interface outside of expander
-                        st.session_state['show_setup_interface'] = server['serverName']
+                        show_iface = ss['show_setup_interface'] = server['serverName']
     
     # Ready to Install tab
     if tab2 and ready_servers:
@@ -162,35 +255,25 @@ def setup_tab():
                 st.metric("Need Setup", len(needs_setup_servers))
             
             # Show all servers in a table
-            server_data = []
-            for server in servers:
-                status = "✅ Ready" if not server['needsSetup'] else f"⚠️ Setup ({server['missingRequirements']} missing)"
-                server_data.append({
-                    "Server": server['displayName'],
-                    "Category": server['category'],
-                    "Status": status,
-                    "Description": server['description'][:50] + "..." if len(server['description']) > 50 else server['description']
-                })
-            
-            if server_data:
+            if names:
                 st.dataframe(server_data, use_container_width=True)
     
     # Show setup interface outside of all expanders/tabs if needed
-    if st.session_state.get('show_setup_interface'):
+    if show_iface:
         st.markdown("---")
-        setup_server_interface(st.session_state['show_setup_interface'])
+        setup_server_interface(show_iface)
         # Clear the interface state when done
-        if st.session_state.get('setup_completed'):
-            del st.session_state['show_setup_interface']
-            if 'setup_completed' in st.session_state:
-                del st.session_state['setup_completed']
+        if ss.get('setup_completed'):
+            ss.pop('show_setup_interface', None)
+            ss.pop('setup_completed', None)
 
 def setup_server_interface(server_name: str):
     """Display the secure setup interface for a specific server"""
     st.markdown(f"### 🔐 Secure Setup for {server_name.title()}")
     
-    # Get server requirements
-    requirements_data = get_server_requirements(server_name)
+    # Get server requirements, from the status payload when it already has them
+    ss = st.session_state
+    requirements_data = ss.get('_reqs_by_server', {}).get(server_name) or get_server_requirements(server_name)
     
     if not requirements_data:
         st.error("Could not load server requirements.")
@@ -212,8 +295,8 @@ def setup_server_interface(server_name: str):
     # Create secure input fields for each missing requirement
     st.markdown("#### 🔑 Enter Credentials")
     
-    credentials = {}
-    all_valid = True
+    # Only installable once every requirement has a value
+    can_install = True
     
     for req in missing_reqs:
         # Create a container for each credential instead of expander
@@ -248,35 +331,31 @@ def setup_server_interface(server_name: str):
                 help=req.get('description', '')
             )
         
-        credentials[req['key']] = credential_value
-        
         # Test credential if provided
         if credential_value:
             col1, col2 = st.columns([1, 3])
             with col1:
                 if st.button(f"🧪 Test", key=f"test_{server_name}_{req['key']}", use_container_width=True):
                     with st.spinner("Testing credential..."):
-                        test_result = test_credentials(server_name, req['key'], credential_value)
+                        test_result = debounced_test_credentials(server_name, req['key'], credential_value)
                         
                         if test_result.get('valid'):
                             st.success("✅ Valid!")
                         else:
                             st.error(f"❌ Invalid: {test_result.get('error', 'Unknown error')}")
-                            all_valid = False
             with col2:
                 # Show masked value for confirmation
-                masked_value = credential_value[:4] + "*" * (len(credential_value) - 8) + credential_value[-4:] if len(credential_value) > 8 else "*" * len(credential_value)
+                n = len(credential_value)
+                masked_value = f"{credential_value[:4]}{'*' * (n - 8)}{credential_value[-4:]}" if n > 8 else "*" * n
                 st.code(f"Value: {masked_value}", language=None)
         else:
-            all_valid = False
+            can_install = False
     
     # Install button (only enabled if all credentials are provided)
     st.markdown("---")
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
-        can_install = all(credentials.values())  # All fields have values
-        
         if st.button(
             f"🚀 Install {server_name.title()} Server",
             disabled=not can_install,
@@ -296,11 +375,9 @@ def setup_server_interface(server_name: str):
                         st.success(f"🎉 {server_name.title()} server installed successfully!")
                         st.balloons()
                         # Clear the setup state
-                        if 'setup_server' in st.session_state:
-                            del st.session_state['setup_server']
-                        if 'show_setup_interface' in st.session_state:
-                            del st.session_state['show_setup_interface']
-                        st.session_state['setup_completed'] = True
+                        ss.pop('setup_server', None)
+                        ss.pop('show_setup_interface', None)
+                        ss['setup_completed'] = True
                         st.rerun()
                     else:
                         st.error(f"❌ Installation failed: {result.get('error', 'Unknown error')}")
@@ -310,8 +387,6 @@ def setup_server_interface(server_name: str):
     # Cancel button
     with col3:
         if st.button("❌ Cancel", use_container_width=True):
-            if 'setup_server' in st.session_state:
-                del st.session_state['setup_server']
-            if 'show_setup_interface' in st.session_state:
-                del st.session_state['show_setup_interface']
+            ss.pop('setup_server', None)
+            ss.pop('show_setup_interface', None)
             st.rerun()
\ No newline at end of file